@@ -3,15 +3,368 @@ Functions for generating synthetic data tables, including chunked writing and ru
 """
 
 import os
+import ast
 import pandas as pd
 import time
 import inspect
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from enum import IntEnum
+from functools import lru_cache
 from faker import Faker
 
-from generators.base_rules import get_generator
+from generators.base_rules import get_batch_generator
+from core.table_store import remove_sidecar, write_csv_rows
 
 fake = Faker()
 OUTPUT_DIR = "output"
+WRITE_BUFFER_SIZE = 1 << 20  # 1 MiB write buffer for chunked CSVs
+CHUNK_QUEUE_SIZE = 2  # Generated chunks waiting for the writer thread
+MAX_RULE_ERRORS = 5  # Per-row rule errors printed per column before the rest are counted
+
+
+def _parse_custom_rule(rule):
+    """
+    Splits a custom rule such as 'func("literal", COLUMN)' into its function name and arguments.
+
+    The rule is parsed with ast: constants become literals (via ast.literal_eval) and bare
+    names are column references. A bare 'func' is a call without arguments. Rules ast cannot
+    read (e.g. column names that are not identifiers) fall back to splitting on commas.
+
+    Returns:
+        tuple: (func_name, args), where args is a list of (is_literal, value) pairs.
+        A literal is the Python value; any other argument is the name of a column in the row.
+    """
+    try:
+        node = ast.parse(rule.strip(), mode="eval").body
+        if isinstance(node, ast.Name):
+            return node.id, []
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and not node.keywords:
+            return node.func.id, [
+                (False, arg.id) if isinstance(arg, ast.Name) else (True, ast.literal_eval(arg))
+                for arg in node.args
+            ]
+    except (SyntaxError, ValueError):
+        pass
+
+    func_name = rule.split("(")[0]
+    args_str = rule[len(func_name)+1:-1]
+    args = []
+    if args_str.strip():
+        for arg in args_str.split(","):
+            arg = arg.strip()
+            if arg.startswith('"') or arg.startswith("'"):
+                args.append((True, ast.literal_eval(arg)))
+            else:
+                args.append((False, arg))
+    return func_name, args
+
+
+def _plan_batch_columns(specs, rules_module):
+    """
+    Finds the custom-rule columns that can be generated for the whole table at once,
+    i.e. whose rule `func` has a `func_batch` variant in rules_module.
+
+    Columns whose rule only takes literal arguments are generated up front, before the row
+    loop (the batch variant receives the literals plus `size`). Columns that read other
+    columns are generated after the loop (the batch variant receives one sequence per column
+    argument), which is only done when no later column reads them.
+
+    Args:
+        specs (list): (name, kind, type, length, rule) per column, as built by generate_table.
+        rules_module (module): Module with custom rule functions.
+
+    Returns:
+        tuple: (upfront, deferred) dicts of {col_name: (func_name, batch_func, args)}.
+    """
+    upfront, deferred = {}, {}
+    if rules_module is None:
+        return upfront, deferred
+
+    parsed = []
+    for col_name, _, _, _, rule in specs:
+        func_name, args = None, []
+        if isinstance(rule, str) and not rule.strip().startswith("faker."):
+            try:
+                func_name, args = _parse_custom_rule(rule)
+            except Exception:
+                func_name, args = None, []
+        parsed.append((col_name, func_name, args))
+
+    for i, (col_name, func_name, args) in enumerate(parsed):
+        batch_func = getattr(rules_module, f"{func_name}_batch", None) if func_name else None
+        if batch_func is None:
+            continue
+        if all(is_literal for is_literal, _ in args):
+            upfront[col_name] = (func_name, batch_func, args)
+        elif not any(
+            not is_literal and value == col_name
+            for _, _, later_args in parsed[i+1:]
+            for is_literal, value in later_args
+        ):
+            deferred[col_name] = (func_name, batch_func, args)
+    return upfront, deferred
+
+
+def _compile_custom_rule(rule, rules_module):
+    """
+    Resolves a custom rule once for the row loop.
+
+    Returns:
+        tuple: (func, args, with_row), with args as from _parse_custom_rule and with_row
+        telling whether func takes the row index as `row_nums`.
+    """
+    func_name, args = _parse_custom_rule(rule)
+    func = getattr(rules_module, func_name)
+    return func, args, 'row_nums' in inspect.signature(func).parameters
+
+
+def _report_rule_error(errors, col_name, rule, e):
+    """
+    Prints a per-row custom rule error, only the first MAX_RULE_ERRORS per column;
+    `errors` counts all of them for _report_suppressed_errors.
+    """
+    errors[col_name] = errors.get(col_name, 0) + 1
+    if errors[col_name] <= MAX_RULE_ERRORS:
+        print(f"[⚠️ ERROR custom rule] {col_name}: {rule} -> {e}")
+
+
+def _report_suppressed_errors(errors):
+    """Prints one summary line per column whose errors went past MAX_RULE_ERRORS."""
+    for col_name, count in errors.items():
+        if count > MAX_RULE_ERRORS:
+            print(f"[⚠️ ERROR custom rule] {col_name}: failed on {count} rows ({count - MAX_RULE_ERRORS} not shown)")
+
+
+def _apply_custom_rule(col_name, rule, func, args, with_row, column_args, num_rows):
+    """
+    Generates a custom-rule column from whole argument columns: `column_args` holds the
+    literal for literal arguments and a sequence of `num_rows` values for column arguments.
+    """
+    values, errors = [], {}
+    for row in range(num_rows):
+        row_args = [
+            column_arg if is_literal else column_arg[row]
+            for (is_literal, _), column_arg in zip(args, column_args)
+        ]
+        try:
+            value = func(*row_args, row_nums=row) if with_row else func(*row_args)
+        except Exception as e:
+            _report_rule_error(errors, col_name, rule, e)
+            value = ""
+        values.append(value)
+    _report_suppressed_errors(errors)
+    return values
+
+
+def _fill_custom_columns_by_row(specs, data, precomputed, deferred, compiled, num_rows):
+    """
+    Fills the custom-rule columns row by row, for rules modules that set ROW_MAJOR_RULES
+    because their rules share per-row state (e.g. a row counter) beyond their arguments.
+    """
+    if not compiled:
+        return
+    # Row plan: each custom rule with its argument sources resolved once. A column argument
+    # reads the list of an earlier column in place (None, i.e. "", for later or deferred ones)
+    visible = {}
+    row_plan = []
+    for col_name, *_ in specs:
+        if col_name in compiled:
+            func, args, with_row, rule = compiled[col_name]
+            sources = [(True, value) if is_literal else (False, visible.get(value)) for is_literal, value in args]
+            data[col_name] = [""] * num_rows
+            row_plan.append((col_name, data[col_name], func, sources, with_row, rule))
+            visible[col_name] = data[col_name]
+        elif col_name in precomputed and col_name not in deferred:
+            visible[col_name] = data[col_name]
+
+    errors = {}
+    for row in range(num_rows):
+        for col_name, out, func, sources, with_row, rule in row_plan:
+            call_args = [
+                value if is_literal else ("" if value is None else value[row])
+                for is_literal, value in sources
+            ]
+            try:
+                out[row] = func(*call_args, row_nums=row) if with_row else func(*call_args)
+            except Exception as e:
+                _report_rule_error(errors, col_name, rule, e)
+    _report_suppressed_errors(errors)
+
+
+def _batch_to_list(values, num_rows):
+    """Converts a batch rule result to a list of Python values, checking its length."""
+    values = values.tolist() if hasattr(values, "tolist") else list(values)
+    if len(values) != num_rows:
+        raise ValueError(f"returned {len(values)} values for {num_rows} rows")
+    return values
+
+
+@lru_cache(maxsize=None)
+def _compile_faker_rule(rule):
+    """
+    Resolves a rule such as 'faker.name()' or 'faker.pyint(max_value=9)' to the bound Faker
+    method and its literal arguments, so values are generated without eval. Cached per rule
+    string: chunks and tables sharing a rule parse it once.
+
+    Returns:
+        tuple: (func, args, kwargs).
+    """
+    call = ast.parse(rule.strip()[6:], mode="eval").body
+    if not isinstance(call, ast.Call) or not isinstance(call.func, ast.Name):
+        raise ValueError("expected a single faker method call")
+    args = tuple(ast.literal_eval(arg) for arg in call.args)
+    kwargs = {kw.arg: ast.literal_eval(kw.value) for kw in call.keywords}
+    return getattr(fake, call.func.id), args, kwargs
+
+
+class RuleKind(IntEnum):
+    """How a column is generated, decided once per table from its FAKE_RULE."""
+    NONE = 0     # no rule: the column stays empty
+    FAKER = 1    # 'faker.<method>(...)'
+    CUSTOM = 2   # 'func(...)' from the domain rules module
+    DEFAULT = 3  # generic generator for the column TYPE/LENGTH
+
+
+def _column_kind(rule, rules_module):
+    """Classifies a FAKE_RULE into a RuleKind."""
+    if pd.isna(rule):
+        return RuleKind.NONE
+    if isinstance(rule, str) and rule.strip().startswith("faker."):
+        return RuleKind.FAKER
+    if isinstance(rule, str) and rules_module:
+        return RuleKind.CUSTOM
+    return RuleKind.DEFAULT
+
+
+def _generate_column(col_name, kind, col_type, length, rule, num_rows):
+    """
+    Generates a whole column for the kinds that neither read other columns nor depend on
+    row order (NONE, FAKER and DEFAULT).
+    """
+    if kind == RuleKind.NONE:
+        return [None] * num_rows
+    if kind == RuleKind.FAKER:
+        try:
+            func, args, kwargs = _compile_faker_rule(rule)
+            return [str(func(*args, **kwargs))[:length] for _ in range(num_rows)]
+        except Exception as e:
+            print(f"[⚠️ ERROR faker] {col_name}: {rule} -> {e}")
+            return [""] * num_rows
+    return get_batch_generator(col_type, length)(num_rows)
+
+
+class TablePlan:
+    """
+    What generating a table derives from the schema once: the column specs, the batch-rule
+    plan and the compiled custom rules. Chunked tables build one plan and call
+    generate_chunk for every chunk.
+    """
+
+    def __init__(self, df_schema, table_name, rules_module=None, domain=None):
+        self.table_name = table_name
+        self.rules_module = rules_module
+        self.domain = domain
+
+        df_table = df_schema[df_schema["TABLE_NAME"] == table_name]
+        # (name, kind, type, length, rule) per column, read from the column arrays in one pass
+        rules = df_table["FAKE_RULE"].to_numpy() if "FAKE_RULE" in df_table else [None] * len(df_table)
+        self.specs = [
+            (col_name, _column_kind(rule, rules_module), col_type, int(length), rule)
+            for col_name, col_type, length, rule in zip(
+                df_table["COLUMN_NAME"].to_numpy(), df_table["TYPE"].to_numpy(),
+                df_table["LENGTH"].to_numpy(), rules
+            )
+        ]
+
+        # Rules with a *_batch variant produce whole columns instead of one value per row
+        self.upfront, self.deferred = _plan_batch_columns(self.specs, rules_module)
+        self.row_major = getattr(rules_module, "ROW_MAJOR_RULES", False)
+
+        # Custom rules are parsed once per table; rules that fail to compile yield "" columns
+        self.compiled, self.broken = {}, set()
+        for col_name, kind, _, _, rule in self.specs:
+            if kind != RuleKind.CUSTOM or col_name in self.deferred:
+                continue
+            try:
+                self.compiled[col_name] = (*_compile_custom_rule(rule, rules_module), rule)
+            except Exception as e:
+                print(f"[⚠️ ERROR custom rule] {col_name}: {rule} -> {e}")
+                self.broken.add(col_name)
+
+    def generate_chunk(self, num_rows):
+        """
+        Generates `num_rows` rows. Columns are generated whole, in column order: each custom
+        rule sees the columns before it. Rules modules setting ROW_MAJOR_RULES get their
+        custom rules called row by row instead.
+
+        Returns:
+            pd.DataFrame: Generated data for the table.
+        """
+        specs, deferred = self.specs, self.deferred
+        data = {col_name: [] for col_name, *_ in specs}
+
+        precomputed = set()
+        for col_name, (func_name, batch_func, args) in self.upfront.items():
+            try:
+                values = batch_func(*[value for _, value in args], size=num_rows)
+                data[col_name] = _batch_to_list(values, num_rows)
+                precomputed.add(col_name)
+            except Exception as e:
+                print(f"[⚠️ ERROR batch rule] {col_name}: {func_name}_batch -> {e}; generating row by row")
+
+        for col_name, kind, col_type, length, rule in specs:
+            if kind != RuleKind.CUSTOM:
+                data[col_name] = _generate_column(col_name, kind, col_type, length, rule, num_rows)
+                precomputed.add(col_name)
+            elif col_name in self.broken and col_name not in precomputed:
+                data[col_name] = [""] * num_rows
+                precomputed.add(col_name)
+
+        compiled = {
+            col_name: rule for col_name, rule in self.compiled.items() if col_name not in precomputed
+        }
+        if self.row_major:
+            _fill_custom_columns_by_row(specs, data, precomputed, deferred, compiled, num_rows)
+        else:
+            # Column-major: each custom column is built whole from the columns before it
+            built = set()
+            for col_name, *_ in specs:
+                if col_name in compiled:
+                    func, args, with_row, rule = compiled[col_name]
+                    column_args = [
+                        value if is_literal else (data[value] if value in built else [""] * num_rows)
+                        for is_literal, value in args
+                    ]
+                    data[col_name] = _apply_custom_rule(col_name, rule, func, args, with_row, column_args, num_rows)
+                if col_name not in deferred:
+                    built.add(col_name)
+
+        # Deferred batch columns only see the columns before them, like the row-by-row path
+        columns = list(data)
+        for col_name, (func_name, batch_func, args) in deferred.items():
+            earlier = columns[:columns.index(col_name)]
+            column_args = [
+                value if is_literal else (data[value] if value in earlier else [""] * num_rows)
+                for is_literal, value in args
+            ]
+            try:
+                data[col_name] = _batch_to_list(batch_func(*column_args), num_rows)
+            except Exception as e:
+                print(f"[⚠️ ERROR batch rule] {col_name}: {func_name}_batch -> {e}; generating row by row")
+                func = getattr(self.rules_module, func_name)
+                with_row = 'row_nums' in inspect.signature(func).parameters
+                data[col_name] = _apply_custom_rule(col_name, func_name, func, args, with_row, column_args, num_rows)
+
+        return pd.DataFrame(data)
+
+
+def prepare_table(df_schema, table_name, rules_module=None, domain=None):
+    """
+    Builds the TablePlan for a table: schema filtering, batch planning and rule compilation
+    done once, reused by every generate_chunk call.
+    """
+    return TablePlan(df_schema, table_name, rules_module, domain)
 
 
 def generate_table(df_schema, table_name, num_rows, rules_module=None, domain=None):
@@ -28,68 +381,35 @@ def generate_table(df_schema, table_name, num_rows, rules_module=None, domain=No
     Returns:
         pd.DataFrame: Generated data for the table.
     """
-    df_table = df_schema[df_schema["TABLE_NAME"] == table_name]
-    data = {col["COLUMN_NAME"]: [] for _, col in df_table.iterrows()}
-
-    for row in range(num_rows):
-        current_row = {}
-        for _, col in df_table.iterrows():
-            col_name = col["COLUMN_NAME"]
-            col_type = col["TYPE"]
-            length = int(col["LENGTH"])
-            rule = col.get("FAKE_RULE", None)
-
-            value = None
-
-            if pd.isna(rule):
-                value = None
-
-            # If the rule starts with "faker.", use the Faker library.
-            elif isinstance(rule, str) and rule.strip().startswith("faker."):
-                try:
-                    func_call = rule.strip()[6:]
-                    # eval is safe here because rules come from controlled configs
-                    value = str(eval(f"fake.{func_call}"))[:length]
-                except Exception as e:
-                    print(f"[⚠️ ERROR faker] {col_name}: {rule} -> {e}")
-                    value = ""
-
-            # If a custom rule is provided and available in the rules_module
-            elif isinstance(rule, str) and rules_module:
-                try:
-                    func_name = rule.split("(")[0]
-                    args_str = rule[len(func_name)+1:-1]
-                    args = []
-                    if args_str.strip():
-                        for arg in args_str.split(","):
-                            arg = arg.strip()
-                            # If the argument is a string literal, eval it; otherwise, pull from current_row
-                            if arg.startswith('"') or arg.startswith("'"):
-                                args.append(eval(arg))
-                            else:
-                                args.append(current_row.get(arg, ""))
-                    func = getattr(rules_module, func_name)
-
-                    # Pass row index only if the function expects it
-                    sig = inspect.signature(func)
-                    if 'row_nums' in sig.parameters:
-                        value = func(*args, row_nums=row)
-                    else:
-                        value = func(*args)
-
-                except Exception as e:
-                    print(f"[⚠️ ERROR custom rule] {col_name}: {rule} -> {e}")
-                    value = ""
+    return prepare_table(df_schema, table_name, rules_module, domain).generate_chunk(num_rows)
 
-            else:
-                value = get_generator(col_type, length)()
 
-            current_row[col_name] = value
+def _write_chunks(chunks, f):
+    """Writer thread: appends the DataFrames taken from `chunks` to `f` until it gets None."""
+    header = True
+    while True:
+        df_chunk = chunks.get()
+        if df_chunk is None:
+            return
+        write_csv_rows(df_chunk, f, header=header)
+        f.flush()  # The file holds every written chunk's rows between chunks
+        header = False
 
-        for col_name in current_row:
-            data[col_name].append(current_row[col_name])
 
-    return pd.DataFrame(data)
+def _put_chunk(chunks, df_chunk, writer, raise_writer_error=True):
+    """
+    Queues a chunk for the writer without blocking on a writer that has stopped: its error
+    is re-raised, or ignored with raise_writer_error=False (another error is propagating).
+    """
+    while True:
+        try:
+            chunks.put(df_chunk, timeout=0.1)
+            return
+        except queue.Full:
+            if writer.done():
+                if raise_writer_error:
+                    writer.result()
+                return
 
 
 def generate_table_chunked(df_schema, table_name, total_rows, rules_module=None, domain=None, chunk_size=5000, column_order=None):
@@ -112,21 +432,35 @@ def generate_table_chunked(df_schema, table_name, total_rows, rules_module=None,
     os.makedirs(output_path, exist_ok=True)
     csv_path = os.path.join(output_path, f"{table_name}.csv")
 
-    # Delete previous output file if it exists
+    # Delete previous output file if it exists (chunked tables are read back from the CSV)
     if os.path.exists(csv_path):
         os.remove(csv_path)
+    remove_sidecar(csv_path)
+
+    # Schema filtering and rule compilation happen once, not per chunk
+    plan = prepare_table(df_schema, table_name, rules_module, domain)
 
     rows_written = 0
-    while rows_written < total_rows:
-        rows_to_generate = min(chunk_size, total_rows - rows_written)
-        print(f"  [Chunk] Generating rows {rows_written+1}-{rows_written+rows_to_generate} for {domain}.{table_name}...")
-        t_chunk = time.perf_counter()
-        df_chunk = generate_table(
-            df_schema, table_name, rows_to_generate, rules_module, domain
-        )
-        if column_order is not None:
-            df_chunk = df_chunk[column_order]
-        df_chunk.to_csv(csv_path, mode='a', header=(rows_written == 0), index=False)
-        print(f"  [Chunk] Chunk time: {time.perf_counter()-t_chunk:.2f}s")
-        rows_written += rows_to_generate
+    # One buffered handle for the whole table. A writer thread serializes chunk N while
+    # chunk N+1 is generated; the bounded queue keeps at most CHUNK_QUEUE_SIZE chunks waiting.
+    chunks = queue.Queue(maxsize=CHUNK_QUEUE_SIZE)
+    with open(csv_path, "wb", buffering=WRITE_BUFFER_SIZE) as f, ThreadPoolExecutor(max_workers=1) as executor:
+        writer = executor.submit(_write_chunks, chunks, f)
+        try:
+            while rows_written < total_rows:
+                rows_to_generate = min(chunk_size, total_rows - rows_written)
+                print(f"  [Chunk] Generating rows {rows_written+1}-{rows_written+rows_to_generate} for {domain}.{table_name}...")
+                t_chunk = time.perf_counter()
+                df_chunk = plan.generate_chunk(rows_to_generate)
+                if column_order is not None:
+                    df_chunk = df_chunk[column_order]
+                _put_chunk(chunks, df_chunk, writer)
+                print(f"  [Chunk] Chunk time: {time.perf_counter()-t_chunk:.2f}s")
+                rows_written += rows_to_generate
+        except BaseException:
+            # Stop the writer, keeping the generation error rather than any writer error
+            _put_chunk(chunks, None, writer, raise_writer_error=False)
+            raise
+        _put_chunk(chunks, None, writer)
+        writer.result()
     print(f"[✅] File saved in chunks: {csv_path}")
@@ -3,8 +3,10 @@ Helpers for domain-specific operations, such as loading custom rule modules.
 """
 
 import importlib
+from functools import lru_cache
 
 
+@lru_cache(maxsize=None)
 def load_domain_rules(domain):
     """
     Dynamically imports and returns the custom rules module for a given domain.
@@ -14,6 +16,7 @@ def load_domain_rules(domain):
 
     Returns:
         module or None: The imported rules module, or None if not found.
+        Both outcomes are cached per domain, so the lookup runs once per domain.
     """
     try:
         module = importlib.import_module(f"generators.custom_rules.{domain}_rules")
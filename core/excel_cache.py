@@ -0,0 +1,64 @@
+"""
+Utility for reading Excel files through an on-disk cache of the parsed DataFrame.
+"""
+
+import glob
+import importlib.util
+import os
+import pandas as pd
+
+CACHE_DIR_NAME = ".cache"
+
+# python-calamine (Rust xlsx parser) is much faster than openpyxl; use it when installed
+EXCEL_ENGINE = "calamine" if importlib.util.find_spec("python_calamine") else None
+
+
+def _cache_path(path):
+    """Returns the sidecar path for `path`, keyed by its modification time."""
+    directory, file_name = os.path.split(os.path.abspath(path))
+    mtime_ns = os.stat(path).st_mtime_ns
+    return os.path.join(directory, CACHE_DIR_NAME, f"{file_name}.{mtime_ns}.pkl")
+
+
+def is_cached(path):
+    """True if the cache holds the current version of `path`."""
+    try:
+        return os.path.exists(_cache_path(path))
+    except OSError:
+        return False
+
+
+def read_excel_cached(path):
+    """
+    Reads an Excel file, reusing a pickled copy of the DataFrame while the file is unchanged.
+
+    The cache lives in a `.cache` folder next to the file and is keyed by the file's mtime,
+    so editing the workbook invalidates it. Any cache error falls back to a plain read.
+
+    Args:
+        path (str): Path to the Excel file.
+
+    Returns:
+        pd.DataFrame: The first sheet of the workbook.
+    """
+    try:
+        cache_path = _cache_path(path)
+        if os.path.exists(cache_path):
+            return pd.read_pickle(cache_path)
+    except Exception as e:
+        print(f"[⚠️ WARNING] Could not read Excel cache for {path}: {e}")
+        cache_path = None
+
+    df = pd.read_excel(path, engine=EXCEL_ENGINE)
+
+    if cache_path is not None:
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            # Drop sidecars left by older versions of the same file
+            stale_pattern = cache_path.rsplit(".", 2)[0] + ".*.pkl"
+            for stale in glob.glob(stale_pattern):
+                os.remove(stale)
+            df.to_pickle(cache_path)
+        except Exception as e:
+            print(f"[⚠️ WARNING] Could not write Excel cache for {path}: {e}")
+    return df
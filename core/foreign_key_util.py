@@ -2,12 +2,42 @@
 Utility for loading and caching foreign key values from CSV files.
 """
 
-import pandas as pd
 import os
-from collections import defaultdict
+from functools import lru_cache
+
+import numpy as np
+
+from core.random_state import RNG as _rng
+from core.table_store import read_table, table_columns
 
 # === GLOBAL CACHE ===
-_foreign_key_cache = defaultdict(list)
+# Unique parent values live in the lru_cache of _load_foreign_values, keyed by file version
+
+
+@lru_cache(maxsize=128)
+def _load_foreign_values(csv_path, column_name, mtime_ns):
+    """
+    Loads the unique, non-null values of `column_name` as a NumPy object array.
+    Cached per file version: `mtime_ns` changes when a table is regenerated this run.
+    """
+    try:
+        if column_name not in table_columns(csv_path):
+            print(f"[⚠️ WARNING] Column '{column_name}' not found in {csv_path}")
+            return None
+        df = read_table(csv_path, [column_name])
+        return np.asarray(df[column_name].dropna().unique(), dtype=object)
+    except Exception as e:
+        print(f"[⚠️ ERROR loading foreign key] {csv_path}.{column_name}: {e}")
+        return None
+
+
+def _foreign_value_array(csv_path, column_name):
+    """Returns the cached unique values of `column_name` for the current file, or None."""
+    if not os.path.isfile(csv_path):
+        print(f"[⚠️ WARNING] File does not exist: {csv_path}")
+        return None
+    return _load_foreign_values(str(csv_path), column_name, os.stat(csv_path).st_mtime_ns)
+
 
 def get_foreign_values(csv_path, column_name):
     """
@@ -20,20 +50,74 @@ def get_foreign_values(csv_path, column_name):
     Returns:
         list: List of unique, non-null values from the column.
     """
-    key = f"{csv_path}.{column_name}"
-    # If not already cached, attempt to load and cache the column's values
-    if key not in _foreign_key_cache:
-        try:
-            if not os.path.isfile(csv_path):
-                print(f"[⚠️ WARNING] File does not exist: {csv_path}")
-                return []
-            df = pd.read_csv(csv_path)
-            if column_name not in df.columns:
-                print(f"[⚠️ WARNING] Column '{column_name}' not found in {csv_path}")
-                return []
-            # Cache unique, non-null values for this file/column
-            _foreign_key_cache[key] = df[column_name].dropna().unique().tolist()
-        except Exception as e:
-            print(f"[⚠️ ERROR loading foreign key] {key}: {e}")
-            return []
-    return _foreign_key_cache[key]
+    values = _foreign_value_array(csv_path, column_name)
+    return [] if values is None else values.tolist()
+
+
+def sample_foreign_indices(csv_path, column_name, n, rng=None):
+    """
+    Draws `n` positions into the unique values of `column_name`, deferring the value
+    lookup to the caller (`values[indices]` when the chunk is materialized).
+
+    Returns:
+        tuple: (values, indices), an object array of unique values and a uint32 array of
+        `n` positions into it. Both are empty if there are no values.
+    """
+    values = _foreign_value_array(csv_path, column_name)
+    if values is None or len(values) == 0:
+        return np.empty(0, dtype=object), np.empty(0, dtype=np.uint32)
+    rng = _rng if rng is None else rng
+    return values, rng.integers(0, len(values), size=n, dtype=np.uint32)
+
+
+def sample_foreign_values(csv_path, column_name, n, rng=None):
+    """
+    Draws `n` values (with replacement) from the unique, non-null values of `column_name`
+    in one vectorized call.
+
+    Args:
+        csv_path (str): Path to the CSV file.
+        column_name (str): Name of the column to sample from.
+        n (int): Number of values to draw.
+        rng (np.random.Generator, optional): Generator to draw with (module default if None).
+
+    Returns:
+        np.ndarray: Object array of `n` values, or an empty array if there are no values.
+    """
+    values, indices = sample_foreign_indices(csv_path, column_name, n, rng)
+    return values[indices]
+
+
+def sample_capped_foreign_values(csv_path, column_name, size, key, usage, fallback, max_uses=2, rng=None):
+    """
+    Draws `size` foreign key values in one vectorized call while keeping a per-value usage
+    cap: a drawn value already used `max_uses` times is replaced by `fallback()`, the rules
+    module's row-by-row foreign_key (which resets the counts once every value is capped).
+
+    Args:
+        csv_path (str): Path to the parent CSV file.
+        column_name (str): Name of the parent column.
+        size (int): Number of values to return.
+        key (str): The "<table>.<column>" prefix of the usage keys.
+        usage (dict): Usage counts (a defaultdict(int)) keyed "<key>.<value>", shared with `fallback`.
+        fallback (callable): Zero-argument function returning one capped value.
+        max_uses (int): Times a value may be used before it is capped.
+        rng (np.random.Generator, optional): Generator to draw with (module default if None).
+
+    Returns:
+        list: `size` values as str, or None if the parent column has no values.
+    """
+    candidates = sample_foreign_values(csv_path, column_name, size, rng)
+    if len(candidates) == 0:
+        return None
+    prefix = f"{key}."
+    values = []
+    for value in candidates.tolist():
+        value = str(value)
+        gen_key = prefix + value
+        if usage[gen_key] < max_uses:
+            usage[gen_key] += 1
+            values.append(value)
+        else:
+            values.append(fallback())
+    return values
@@ -0,0 +1,18 @@
+"""
+Shared NumPy random generator for batch rules, foreign key sampling and default columns.
+"""
+
+import os
+import numpy as np
+
+# One Generator per process, so all vectorized draws share a single stream
+RNG = np.random.default_rng()
+
+
+def _reseed():
+    """Gives a forked worker its own stream instead of a copy of the parent's."""
+    RNG.bit_generator.state = np.random.PCG64().state
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reseed)
@@ -4,11 +4,16 @@ Module for loading table schema definitions from Excel files.
 This module reads all `.xlsx` files inside the given `definitions` directory
 and builds a dictionary mapping each domain (based on filename) to a DataFrame
 containing its schema. The schema is standardized by normalizing types and
-lengths.
+lengths. Parsed workbooks are reused from the `.cache` folder (see
+`core.excel_cache`) while the files are unchanged; on a cold cache the
+workbooks are parsed in parallel processes.
 """
 
 import os
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+
+from core.excel_cache import is_cached, read_excel_cached
 
 
 def load_all_schemas(definitions_dir="definitions"):
@@ -30,22 +35,34 @@ def load_all_schemas(definitions_dir="definitions"):
         schema info.
     """
     schema_dict = {}
+    paths = {
+        file.replace(".xlsx", ""): os.path.join(definitions_dir, file)
+        for file in os.listdir(definitions_dir)
+        if file.endswith(".xlsx")
+    }
+
+    # Workbooks missing from the cache need a full Excel parse; spread those over processes
+    parsed = {}
+    uncached = [path for path in paths.values() if not is_cached(path)]
+    workers = min(len(uncached), os.cpu_count() or 1)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            parsed = dict(zip(uncached, executor.map(read_excel_cached, uncached)))
 
-    for file in os.listdir(definitions_dir):
-        if file.endswith(".xlsx"):
-            domain = file.replace(".xlsx", "")
-            df = pd.read_excel(os.path.join(definitions_dir, file))
+    for domain, path in paths.items():
+        # Parsed workbooks are cached on disk until the file's mtime changes
+        df = parsed[path] if path in parsed else read_excel_cached(path)
 
-            df["TYPE"] = (
-                df["TYPE"]
-                .astype(str)
-                .str.lower()
-                .replace("text", "varchar")
-                .replace("number", "int")
-            )
+        df["TYPE"] = (
+            df["TYPE"]
+            .astype(str)
+            .str.lower()
+            .replace("text", "varchar")
+            .replace("number", "int")
+        )
 
-            df["LENGTH"] = pd.to_numeric(df["LENGTH"], errors="coerce").fillna(10).astype(int)
+        df["LENGTH"] = pd.to_numeric(df["LENGTH"], errors="coerce").fillna(10).astype(int)
 
-            schema_dict[domain] = df
+        schema_dict[domain] = df
 
     return schema_dict
@@ -0,0 +1,183 @@
+"""
+Utility for writing generated tables and reading them back, preferring a Parquet sidecar
+over the CSV.
+
+Each CSV written in one piece gets a `<table>.parquet` copy next to it. Parquet keeps the
+generated types and loads only the requested columns, so parent lookups and foreign key
+loads skip CSV parsing. The CSV stays the source of truth: a sidecar older than its CSV
+is ignored, and everything falls back to the CSV when pyarrow is not installed.
+"""
+
+import os
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is optional, the CSVs are always readable
+    pa = None
+    pacsv = None
+    pq = None
+
+
+def sidecar_path(csv_path):
+    """Returns the Parquet sidecar path for a CSV path."""
+    return os.path.splitext(csv_path)[0] + ".parquet"
+
+
+def remove_sidecar(csv_path):
+    """Deletes the Parquet sidecar of `csv_path`, if any."""
+    path = sidecar_path(csv_path)
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def write_sidecar(df, csv_path):
+    """
+    Writes `df` as the Parquet sidecar of `csv_path`. Columns pyarrow cannot type (e.g. mixed
+    ints and strings) make it skip the sidecar, leaving readers on the CSV.
+    """
+    if pq is None:
+        return
+    try:
+        pq.write_table(pa.Table.from_pandas(df, preserve_index=False), sidecar_path(csv_path))
+    except Exception as e:
+        print(f"[⚠️ WARNING] No Parquet sidecar for {csv_path}: {e}")
+        remove_sidecar(csv_path)
+
+
+def _fast_path_writable(df):
+    """
+    True when both fast writers (pyarrow and _format_csv_body) render `df` exactly like
+    DataFrame.to_csv: integer columns and columns holding only strings or integers.
+    Floats, booleans and dates are rendered differently ("1" vs "1.0", "true" vs "True",
+    a ".000000" suffix), and a lone empty field comes out as a blank line where pandas
+    writes '""'. Everything else is left to pandas.
+    """
+    if len(df.columns) < 2:
+        return False
+    for _, col in df.items():
+        if pd.api.types.is_integer_dtype(col.dtype):
+            continue
+        if not (pd.api.types.is_object_dtype(col.dtype) or pd.api.types.is_string_dtype(col.dtype)):
+            return False
+        if pd.api.types.infer_dtype(col, skipna=True) not in ("string", "integer", "empty"):
+            return False
+    return True
+
+
+def _format_csv_body(df):
+    """
+    Renders the rows of `df` as CSV text like DataFrame.to_csv (minimal quoting, "\n" line
+    ends), one column at a time. Only called on frames _fast_path_writable accepts; returns
+    None for values with a bare carriage return, which are left to pandas.
+    """
+    columns = []
+    for _, col in df.items():
+        if col.dtype.kind in "iu":
+            columns.append(col.astype(str).tolist())
+            continue
+        values = col.astype(object).where(col.notna(), "").tolist()
+        if pd.api.types.infer_dtype(col, skipna=True) == "integer":
+            values = [str(v) for v in values]
+        joined = "\x00".join(values)
+        if "\r" in joined:
+            return None  # pandas' quoting of bare carriage returns is left to pandas
+        if "," in joined or '"' in joined or "\n" in joined:
+            values = [
+                '"' + v.replace('"', '""') + '"' if ("," in v or '"' in v or "\n" in v) else v
+                for v in values
+            ]
+        columns.append(values)
+    if len(df) == 0:
+        return ""
+    return "\n".join(map(",".join, zip(*columns))) + "\n"
+
+
+def write_csv(df, csv_path):
+    """Writes `df` to `csv_path` as CSV (see write_csv_rows)."""
+    with open(csv_path, "wb") as f:
+        write_csv_rows(df, f)
+
+
+def write_csv_rows(df, f, header=True):
+    """
+    Writes `df` as CSV to the open binary file `f`, with the same bytes as DataFrame.to_csv
+    (lineterminator="\n"). Frames _fast_path_writable accepts go through pyarrow's C++
+    writer when installed, else through _format_csv_body; the rest through pandas.
+    Chunked tables call this once per chunk on one handle.
+
+    Args:
+        df (pd.DataFrame): Data to write.
+        f (file): Binary file object to write to.
+        header (bool): Write the header row first.
+    """
+    body = None
+    fast = _fast_path_writable(df)
+    if fast and pacsv is not None:
+        try:
+            # quoting_style="none" rejects values needing quotes, so fields are never
+            # quoted differently from pandas; those frames take the formatter below
+            sink = pa.BufferOutputStream()
+            options = pacsv.WriteOptions(include_header=False, quoting_style="none")
+            pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), sink, write_options=options)
+            body = sink.getvalue().to_pybytes()
+        except (pa.ArrowException, TypeError, ValueError, OverflowError):
+            pass  # e.g. a value with a comma, or an int beyond int64
+    if fast and body is None:
+        # Columnar formatter: frames pyarrow rejected (values needing quotes) or no pyarrow
+        text = _format_csv_body(df)
+        body = None if text is None else text.encode("utf-8")
+    if header:
+        f.write(df.head(0).to_csv(index=False, lineterminator="\n").encode("utf-8"))
+    if body is not None:
+        f.write(body)
+    else:
+        df.to_csv(f, header=False, index=False, lineterminator="\n")
+
+
+def fresh_sidecar(csv_path):
+    """Returns the sidecar path if it exists and is not older than the CSV, else None."""
+    if pq is None:
+        return None
+    path = sidecar_path(csv_path)
+    if not os.path.exists(path):
+        return None
+    if os.path.exists(csv_path) and os.path.getmtime(path) < os.path.getmtime(csv_path):
+        return None
+    return path
+
+
+def table_columns(csv_path):
+    """Returns the column names of a generated table."""
+    path = fresh_sidecar(csv_path)
+    if path is not None:
+        return list(pq.read_schema(path).names)
+    return list(pd.read_csv(csv_path, nrows=0).columns)
+
+
+def read_table(csv_path, columns=None, as_str=False):
+    """
+    Reads a generated table from its Parquet sidecar when fresh, else from the CSV.
+
+    Args:
+        csv_path (str): Path to the CSV file.
+        columns (list, optional): Columns to load (all by default).
+        as_str (bool): Load every value as str (missing values stay null).
+
+    Returns:
+        pd.DataFrame: The table data.
+    """
+    path = fresh_sidecar(csv_path)
+    if path is not None:
+        try:
+            table = pq.read_table(path, columns=columns)
+            if as_str:
+                table = table.cast(pa.schema([(name, pa.string()) for name in table.column_names]))
+            return table.to_pandas()
+        except Exception as e:
+            print(f"[⚠️ WARNING] Could not read {path}, using the CSV: {e}")
+    if as_str:
+        return pd.read_csv(csv_path, usecols=columns, dtype=str, engine="c", memory_map=True)
+    return pd.read_csv(csv_path, usecols=columns)
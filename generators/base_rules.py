@@ -4,10 +4,14 @@ Base generator rules for synthetic data creation, mapping types to value generat
 
 from faker import Faker
 import random
+from functools import lru_cache
+
+from core.random_state import RNG as _rng
 
 fake = Faker()
 
 
+@lru_cache(maxsize=None)
 def get_generator(dtype: str, length: int = 10):
     """
     Returns a generator function for the specified data type and length.
@@ -18,6 +22,7 @@ def get_generator(dtype: str, length: int = 10):
 
     Returns:
         function: A zero-argument function that returns a synthetic value of the desired type/length.
+        Generators are memoized per (dtype, length), so columns sharing a type reuse one.
     """
     dtype = dtype.lower()
 
@@ -32,3 +37,31 @@ def get_generator(dtype: str, length: int = 10):
     else:
         # Default for unsupported types
         return lambda: "UNKNOWN"
+
+
+@lru_cache(maxsize=None)
+def get_batch_generator(dtype: str, length: int = 10):
+    """
+    Whole-column counterpart of get_generator: returns a function `n -> list of n values`
+    with the same distribution, drawing all values in one call where possible.
+
+    Args:
+        dtype (str): Data type (e.g., 'varchar', 'int').
+        length (int, optional): Maximum length/size of the value.
+
+    Returns:
+        function: A function taking a row count and returning that many values.
+    """
+    dtype = dtype.lower()
+
+    if "varchar" in dtype:
+        # One Faker call draws all the words
+        return lambda n: [word[:length] for word in fake.words(nb=n)] if n else []
+
+    elif "int" in dtype and length <= 18:
+        # Integers of exactly `length` digits (a single digit 0-9 for length <= 1), within int64
+        low, high = (10**(length-1), 10**length) if length > 1 else (0, 10)
+        return lambda n: _rng.integers(low, high, size=n).astype(str).tolist()
+
+    generator = get_generator(dtype, length)
+    return lambda n: [generator() for _ in range(n)]
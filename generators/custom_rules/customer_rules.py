@@ -17,8 +17,10 @@ from __future__ import annotations
 
 # Standard library imports
 import json
+import os
 import random
 import re
+import string
 from collections import defaultdict
 from pathlib import Path
 from typing import Dict, Generator, List, Optional
@@ -29,7 +31,12 @@ import pytz
 from faker import Faker
 
 # Local imports
-from core.foreign_key_util import get_foreign_values
+from core.foreign_key_util import get_foreign_values, sample_capped_foreign_values
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # orjson is optional, the stdlib parser is the fallback
+    _json_loads = json.loads
 
 
 # ----------------------------------------------------------------------------
@@ -43,12 +50,31 @@ RESOURCE_PATH = Path(__file__).resolve().parent / "../resources/address_data.jso
 faker_us = Faker()             # Faker for United States
 faker_ca = Faker("en_CA")     # Faker for Canada
 
+# Faker values are pooled per provider: the first FAKER_POOL_SIZE calls hit Faker and
+# fill the pool, later calls sample from it. FAKER_POOL_SIZE=0 calls Faker every time.
+_FAKER_POOL_SIZE = int(os.environ.get("FAKER_POOL_SIZE", 10_000))
+_faker_pools: Dict[str, List[str]] = defaultdict(list)
+
 # Internal caches to optimize lookups and ensure referential integrity
 _pk_cache: Dict[str, List[str]] = defaultdict(list)
-_pk_generator: Dict[str, List[str]] = defaultdict(list)
+_pk_usage: Dict[str, int] = defaultdict(int)
 _row_generator_cache: Dict[int, Dict[str, str]] = {}
 _lookup_cache: Dict[str, Dict[str, pd.Series]] = {}
 
+
+def _faker_value(pool_name: str, provider) -> str:
+    """
+    Return a value for `provider`, drawn from (or added to) the named pool.
+    """
+    if _FAKER_POOL_SIZE <= 0:
+        return provider()
+    pool = _faker_pools[pool_name]
+    if len(pool) < _FAKER_POOL_SIZE:
+        value = provider()
+        pool.append(value)
+        return value
+    return random.choice(pool)
+
 # ----------------------------------------------------------------------------
 # Time zone helpers
 # ----------------------------------------------------------------------------
@@ -108,16 +134,24 @@ def get_customer_number() -> int:
 # Address helpers
 # ----------------------------------------------------------------------------
 # Load address data pool once at module import
-with open(RESOURCE_PATH, "r") as f:
-    _ADDRESS_POOL = json.load(f)
+with open(RESOURCE_PATH, "rb") as f:
+    _ADDRESS_POOL = _json_loads(f.read())
 _STREET_LOOKUP = {entry["STREET"]: entry for entry in _ADDRESS_POOL}
+_STREET_KEYS = tuple(_STREET_LOOKUP)
 
 
 def get_street() -> str:
     """
     Return a random street name from the loaded address pool.
     """
-    return random.choice(list(_STREET_LOOKUP.keys()))
+    return random.choice(_STREET_KEYS)
+
+
+def get_street_batch(size: int) -> List[str]:
+    """
+    Batch variant of get_street: `size` street names drawn in one call.
+    """
+    return random.choices(_STREET_KEYS, k=size)
 
 
 def _addr_lookup(street: str, key: str) -> str:
@@ -156,13 +190,21 @@ def get_langu_corr(street: str) -> str:
 # ----------------------------------------------------------------------------
 _EMAIL_BLOCK_PROB = 0.746   # Probability to simulate missing email
 _PHONE_BLOCK_PROB = 0.2924  # Probability to simulate missing phone number
+_RE_NON_ALNUM = re.compile(r"[^a-zA-Z0-9]")
+# Same filter as _RE_NON_ALNUM for ASCII input, applied with a single str.translate
+_DELETE_NON_ALNUM = str.maketrans(
+    "", "", "".join(c for c in map(chr, range(128)) if c not in string.ascii_letters + string.digits)
+)
 
 
 def _clean_string(token: Optional[str]) -> str:
     """
     Normalize a string by removing non-alphanumeric characters and lowercasing.
     """
-    return re.sub(r"[^a-zA-Z0-9]", "", token or "").lower()
+    token = token or ""
+    if token.isascii():
+        return token.translate(_DELETE_NON_ALNUM).lower()
+    return _RE_NON_ALNUM.sub("", token).lower()
 
 
 def email_from_name_company(
@@ -185,9 +227,9 @@ def email_from_name_company(
     if first and last:
         user_part = f"{first}.{last}"
     else:
-        user_part = first or last or faker_us.user_name()
+        user_part = first or last or _faker_value("user_name", faker_us.user_name)
 
-    domain = f"{company_clean}.com" if company_clean else faker_us.free_email_domain()
+    domain = f"{company_clean}.com" if company_clean else _faker_value("free_email_domain", faker_us.free_email_domain)
     return f"{user_part}@{domain}"
 
 
@@ -214,9 +256,9 @@ def telephone_by_country(country: str) -> Optional[str]:
     if random.random() < _PHONE_BLOCK_PROB:
         return None
     if country.upper() == "USA":
-        return faker_us.phone_number()
+        return _faker_value("phone_us", faker_us.phone_number)
     if country.upper() == "CANADA":
-        return faker_ca.phone_number()
+        return _faker_value("phone_ca", faker_ca.phone_number)
     return None
 
 # ----------------------------------------------------------------------------
@@ -333,29 +375,43 @@ def foreign_key(
         print(f"[⚠️ WARNING] _pk_cache empty for {key}")
         return ""
 
-    attempts = len(_pk_cache[key]) * 2
+    pool, choice = _pk_cache[key], random.choice
+    attempts = len(pool) * 2
     for _ in range(attempts):
-        val = str(random.choice(_pk_cache[key]))
+        val = str(choice(pool))
         gen_key = f"{key}.{val}"
-        if len(_pk_generator[gen_key]) < 2:
-            _pk_generator[gen_key].append(val)
+        if _pk_usage[gen_key] < 2:
+            _pk_usage[gen_key] += 1
             if row_num is not None:
                 _row_generator_cache[row_num] = {column_name: val}
             return val
 
     # Reset generator if all keys are saturated
     print(f"[♻️ RESET] Resetting generators for {key}")
-    for g in list(_pk_generator):
+    for g in list(_pk_usage):
         if g.startswith(f"{key}."):
-            del _pk_generator[g]
+            del _pk_usage[g]
     # Pick a key after reset
-    val = str(random.choice(_pk_cache[key]))
-    _pk_generator[f"{key}.{val}"].append(val)
+    val = str(choice(pool))
+    _pk_usage[f"{key}.{val}"] += 1
     if row_num is not None:
         _row_generator_cache[row_num] = {column_name: val}
     return val
 
 
+def foreign_key_batch(table_name: str, column_name: str, size: int) -> List[str]:
+    """Batch variant of foreign_key, under the same usage cap (see sample_capped_foreign_values)."""
+    key = f"{table_name}.{column_name}"
+    path = OUTPUT_DIR / DOMAIN / f"{table_name}.csv"
+    values = sample_capped_foreign_values(
+        path, column_name, size, key, _pk_usage, lambda: foreign_key(table_name, column_name)
+    )
+    if values is None:
+        print(f"[⚠️ WARNING] _pk_cache empty for {key}")
+        return [""] * size
+    return values
+
+
 def _make_lookup_key(table: str, fk: str, domain: str = DOMAIN) -> str:
     """Construct a unique cache key for lookup maps."""
     return f"{domain}.{table}.{fk}"
@@ -405,9 +461,11 @@ _DUNS_TYPE_TO_ID = {
     "DNB Headquarters": "YDNB04",
 }
 
+_DUNS_TYPES = tuple(_DUNS_TYPE_TO_ID)
+
 def get_type_duns_data() -> str:
     """Pick a random D-U-N-S data type."""
-    return random.choice(list(_DUNS_TYPE_TO_ID.keys()))
+    return random.choice(_DUNS_TYPES)
 
 
 def get_id_duns_data(type_value: str) -> str:
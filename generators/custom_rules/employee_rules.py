@@ -7,9 +7,18 @@ from datetime import datetime, timedelta
 from collections import defaultdict
 from core.foreign_key_util import get_foreign_values
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # orjson is optional, the stdlib parser is the fallback
+    _json_loads = json.loads
+
 OUTPUT_DIR = "output"
 DOMAIN = "employee"
 
+# The date rules read _row_generator_cache[row_num-1], written by foreign_key for the same
+# row, so the generator must call these rules row by row
+ROW_MAJOR_RULES = True
+
 
 
 row_num = 0
@@ -17,7 +26,7 @@ person_end_dates = {}
 person_start_dates = {}
 _row_generator_cache = {}
 _pk_cache = defaultdict(list)
-_pk_generator = defaultdict(list)
+_pk_usage = defaultdict(int)
 _lookup_cache = {}
 
 # === UTILS ===
@@ -95,14 +104,14 @@ def generate_person_number():
         # If prefix is longer, occasionally allow length 9 (rare in your data)
         if num_length < 3:
             num_length = 9 - len(prefix)
-        digits = ''.join(random.choices("0123456789", k=num_length))
+        digits = f"{random.randrange(10 ** num_length):0{num_length}d}"
         return prefix + digits
 
     else:  # only_numbers
         # Most numeric IDs start with '50'
         prefix = "50"
         # Fill up to 8 digits
-        digits = ''.join(random.choices("0123456789", k=6))
+        digits = f"{random.randrange(1_000_000):06d}"
         return prefix + digits
 
 # === DATES ===
@@ -190,14 +199,15 @@ def foreign_key(table_name, column_name):
         print(f"[⚠️ WARNING] No hay valores en _pk_cache para {key}")
         return ""
 
+    pool, choice = _pk_cache[key], random.choice
     attempts = 0
-    max_attempts = len(_pk_cache[key]) * 2
+    max_attempts = len(pool) * 2
     while attempts < max_attempts:
-        value = str(random.choice(_pk_cache[key]))
+        value = str(choice(pool))
         gen_key = f"{key}.{value}"
-        count = len(_pk_generator[gen_key])
+        count = _pk_usage[gen_key]
         if count < 2:
-            _pk_generator[gen_key].append(value)
+            _pk_usage[gen_key] += 1
             _row_generator_cache[row_num] = generate_dic(column_name, value)
             row_num += 1 
             return value
@@ -205,13 +215,13 @@ def foreign_key(table_name, column_name):
 
     # ♻️ Reset contador y vuelve a intentar
     print(f"[♻️ RESET] Reiniciando contador para {key}")
-    keys_to_reset = [k for k in _pk_generator if k.startswith(f"{key}.")]
+    keys_to_reset = [k for k in _pk_usage if k.startswith(f"{key}.")]
     for k in keys_to_reset:
-        del _pk_generator[k]
+        del _pk_usage[k]
 
     # Ahora elegir un nuevo valor limpio
-    value = str(random.choice(_pk_cache[key]))
-    _pk_generator[f"{key}.{value}"].append(value)
+    value = str(choice(pool))
+    _pk_usage[f"{key}.{value}"] += 1
     _row_generator_cache[row_num] = generate_dic(column_name, value)
     row_num += 1  
     return value
@@ -301,15 +311,16 @@ def get_Organizational_Unit(company_code):
 RESOURCE_PATH_SAP = os.path.join(os.path.dirname(__file__), "../resources/person_info.json")
 
 
-with open(RESOURCE_PATH_SAP, "r") as f:
-    SAP_PERSON_POOL = json.load(f)
+with open(RESOURCE_PATH_SAP, "rb") as f:
+    SAP_PERSON_POOL = _json_loads(f.read())
 
 PERSON_ID_LOOKUP = {person["PERSON_ID"]: person for person in SAP_PERSON_POOL}
+PERSON_IDS = tuple(PERSON_ID_LOOKUP)
 
 
 def get_person_id():
     """Returns a random Person ID (Initials) from the SAP dummy data pool."""
-    return random.choice(list(PERSON_ID_LOOKUP.keys()))
+    return random.choice(PERSON_IDS)
 
 
 def get_inits(person_id):
@@ -380,18 +391,19 @@ RESOURCE_PATH_COM = os.path.join(os.path.dirname(__file__), "../resources/commun
 
 
 # === LOAD ADDRESS POOL ===
-with open(RESOURCE_PATH_COM, "r") as f:
-    COMMUNICATION_POOL = json.load(f)
+with open(RESOURCE_PATH_COM, "rb") as f:
+    COMMUNICATION_POOL = _json_loads(f.read())
 
 # Suponiendo que ya cargaste COMMUNICATION_POOL y creaste el lookup:
 COMMUNICATION_ID_LOOKUP = {comm["ID"]: comm for comm in COMMUNICATION_POOL}
+COMMUNICATION_IDS = tuple(COMMUNICATION_ID_LOOKUP)
 
 def get_random_subty_spa0006() -> str:
     return random.choice(['1','2','3','4'])
 
 def get_comm_id():
     """Returns a random Address ID from the address pool."""
-    return random.choice(list(COMMUNICATION_ID_LOOKUP.keys()))
+    return random.choice(COMMUNICATION_IDS)
 
 
 def get_Type_COM01(comm_id):
@@ -513,16 +525,17 @@ def generate_sobid_s() -> str:
 RESOURCE_PATH = os.path.join(os.path.dirname(__file__), "../resources/employee_addresses_data.json")
 
 # === LOAD ADDRESS POOL ===
-with open(RESOURCE_PATH, "r") as f:
-    ADDRESS_POOL = json.load(f)
+with open(RESOURCE_PATH, "rb") as f:
+    ADDRESS_POOL = _json_loads(f.read())
 
 # Creamos un lookup por Address ID (opcional si lo usas luego)
 ADDRESS_ID_LOOKUP = {addr["Address ID"]: addr for addr in ADDRESS_POOL}
+ADDRESS_IDS = tuple(ADDRESS_ID_LOOKUP)
 
 
 def get_address_id():
     """Returns a random Address ID from the address pool."""
-    return random.choice(list(ADDRESS_ID_LOOKUP.keys()))
+    return random.choice(ADDRESS_IDS)
 
 def get_post_stree_and_house_number(address_id):
     """Returns the postal code for a given street."""
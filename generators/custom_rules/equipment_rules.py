@@ -13,8 +13,13 @@ import json
 import random
 from faker import Faker
 from datetime import datetime
-from collections import defaultdict
-from core.foreign_key_util import get_foreign_values
+from collections import defaultdict, deque
+from core.foreign_key_util import get_foreign_values, sample_capped_foreign_values
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # orjson is optional, the stdlib parser is the fallback
+    _json_loads = json.loads
 
 fake = Faker()
 
@@ -27,8 +32,8 @@ RESOURCE_PATH = os.path.join(
     os.path.dirname(__file__), 
     "../resources/equipment_descriptions.json"
 )
-with open(RESOURCE_PATH, "r") as f:
-    EQUIPMENT_POOL = json.load(f)
+with open(RESOURCE_PATH, "rb") as f:
+    EQUIPMENT_POOL = _json_loads(f.read())
 
 # --- OPTIMIZED LOOKUP FOR MATERIAL_NUMBER ---
 MATERIAL_LOOKUP = {equip["Material Number"]: equip for equip in EQUIPMENT_POOL}
@@ -36,7 +41,7 @@ MATERIAL_LOOKUP = {equip["Material Number"]: equip for equip in EQUIPMENT_POOL}
 # === Unique number tracking ===
 material_number_set = set()
 equipment_number_set = set()
-fk_equipment_number_set = set()
+_unused_equipment_numbers = deque()  # Equipment numbers not yet handed out by fk_copy
 product_number_set = set()
 
 PATTERN_LETTERS = ['N', 'S', 'K', 'E', 'W', 'R', 'P', 'T', 'L']
@@ -118,6 +123,7 @@ def equipment_number():
         eq_num = fake.bothify(pattern).upper()
         if eq_num not in equipment_number_set:
             equipment_number_set.add(eq_num)
+            _unused_equipment_numbers.append(eq_num)
             return eq_num
 
 def generate_dic(column_name, value):
@@ -130,7 +136,7 @@ OUTPUT_DIR = "output"
 DOMAIN = "equipment"
 
 _pk_cache = defaultdict(list)     
-_pk_generator = defaultdict(list)    # Tracks value usage count
+_pk_usage = defaultdict(int)        # Tracks value usage count
 _row_generator_cache = {}
 
 def foreign_key(table_name, column_name, row_nums=None):
@@ -145,34 +151,50 @@ def foreign_key(table_name, column_name, row_nums=None):
     if not _pk_cache[key]:
         print(f"[⚠️ WARNING] No values in _pk_cache for {key}")
         return ""
+    pool, choice = _pk_cache[key], random.choice
     attempts = 0
-    max_attempts = len(_pk_cache[key]) * 2
+    max_attempts = len(pool) * 2
     while attempts < max_attempts:
-        value = str(random.choice(_pk_cache[key]))
+        value = str(choice(pool))
         gen_key = f"{key}.{value}"
-        count = len(_pk_generator[gen_key])
+        count = _pk_usage[gen_key]
         if count < 2:
-            _pk_generator[gen_key].append(value)
-            _row_generator_cache[row_num] = generate_dic(column_name, value)
-            row_num += 1 
+            _pk_usage[gen_key] += 1
+            if row_num is not None:
+                _row_generator_cache[row_num] = generate_dic(column_name, value)
             return value
         attempts += 1
     # ♻️ Reset counter and try again
     print(f"[♻️ RESET] Resetting counter for {key}")
-    keys_to_reset = [k for k in _pk_generator if k.startswith(f"{key}.")]
+    keys_to_reset = [k for k in _pk_usage if k.startswith(f"{key}.")]
     for k in keys_to_reset:
-        del _pk_generator[k]
-    value = str(random.choice(_pk_cache[key]))
-    _pk_generator[f"{key}.{value}"].append(value)
-    _row_generator_cache[row_num] = generate_dic(column_name, value)
-    row_num += 1  
+        del _pk_usage[k]
+    value = str(choice(pool))
+    _pk_usage[f"{key}.{value}"] += 1
+    if row_num is not None:
+        _row_generator_cache[row_num] = generate_dic(column_name, value)
     return value
 
+def foreign_key_batch(table_name, column_name, size):
+    """Returns `size` foreign key values at once, capped like foreign_key via sample_capped_foreign_values."""
+    key = f"{table_name}.{column_name}"
+    target_path = os.path.join(OUTPUT_DIR, DOMAIN, f"{table_name}.csv")
+    values = sample_capped_foreign_values(
+        target_path, column_name, size, key, _pk_usage, lambda: foreign_key(table_name, column_name)
+    )
+    if values is None:
+        print(f"[⚠️ WARNING] No values in _pk_cache for {key}")
+        return [""] * size
+    return values
+
 def fk_copy():
     """
-    Returns an equipment number not yet used in fk_equipment_number_set.
+    Returns the oldest equipment number not yet handed out by fk_copy.
     """
-    for equipment_id in equipment_number_set:
-        if equipment_id not in fk_equipment_number_set:
-            fk_equipment_number_set.add(equipment_id)
-            return equipment_id
+    return _unused_equipment_numbers.popleft() if _unused_equipment_numbers else None
+
+def fk_copy_batch(size):
+    """Batch variant of fk_copy: the `size` oldest equipment numbers not yet handed out, None past the end."""
+    count = min(size, len(_unused_equipment_numbers))
+    values = [_unused_equipment_numbers.popleft() for _ in range(count)]
+    return values + [None] * (size - count)
@@ -2,29 +2,38 @@ import random
 import string
 import os
 from datetime import datetime
+from functools import lru_cache
 import pandas as pd
 import numpy as np
 import json
 from core.foreign_key_util import get_foreign_values
+from core.random_state import RNG as _rng
+from core.table_store import fresh_sidecar, read_table
+
+try:
+    import pyarrow.csv as pacsv
+except ImportError:  # pyarrow is optional, pandas' reader is the fallback
+    pacsv = None
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # orjson is optional, the stdlib parser is the fallback
+    _json_loads = json.loads
 
 
 PATTERN_LETTERS = ['N', 'S', 'K', 'E', 'W', 'R', 'P', 'T', 'L']
 
-# Set for fast uniqueness checking
+# Zero-padded digit blocks rendered once, so product numbers are built by indexing
+_THREE_DIGITS = tuple(f"{i:03d}" for i in range(1000))
+_FIVE_DIGITS = tuple(f"{i:05d}" for i in range(100000))
+
+# Upper bound for product_number_set and cached parent rows, override with SDG_MAX_UNIQUE_IDS
+_MAX_UNIQUE_IDS = int(os.environ.get("SDG_MAX_UNIQUE_IDS", 2_000_000))
+
+# Set for fast uniqueness checking; product numbers are ASCII and stored as bytes to save memory
 product_number_set = set()
-product_number_fk_smakt = set()
-product_number_fk_smarm = set()
-product_number_fk_smean = set()
-product_number_fk_smvke = set()
-product_number_fk_smlan = set()
-product_number_fk_smarc = set()
-product_number_fk_smard = set()
-product_number_fk_smrparea = set()
-product_number_fk_smlgn = set()
-product_number_fk_smlgt = set()
-product_number_fk_smbew = set()
-product_number_fk_smbew_current = set()
-product_number_fk_smbew_future = set()
+# Product numbers in generation order (the same bytes objects held in product_number_set)
+_product_numbers = []
 
 
 # Dict if you want to store more details (optional)
@@ -34,6 +43,16 @@ product_number_dict = dict()
 def default_value(source_value):
     return source_value
 
+def _check_unique_id_cap():
+    """
+    Raises once product_number_set holds _MAX_UNIQUE_IDS entries, instead of growing without bound.
+    """
+    if len(product_number_set) >= _MAX_UNIQUE_IDS:
+        raise RuntimeError(
+            f"product_number_set reached {_MAX_UNIQUE_IDS} entries; "
+            "set SDG_MAX_UNIQUE_IDS to allow more product numbers."
+        )
+
 def generate_product_number(letter=None, store_in_dict=False):
     """
     Generates a unique product number and stores it in a set/dict for uniqueness validation.
@@ -53,13 +72,60 @@ def generate_product_number(letter=None, store_in_dict=False):
 
         first_three = random.randint(0, 999)
         last_five = random.randint(0, 99999)
-        product_number = f"{first_three:03d}{l}{last_five:05d}"
+        product_number = _THREE_DIGITS[first_three] + l + _FIVE_DIGITS[last_five]
 
-        if product_number not in product_number_set:
-            product_number_set.add(product_number)
+        key = product_number.encode('ascii')
+        if key not in product_number_set:
+            _check_unique_id_cap()
+            product_number_set.add(key)
+            _product_numbers.append(key)
             return product_number
         # Else, loop again to get a new product number
 
+def generate_product_number_batch(letter=None, store_in_dict=False, size=1):
+    """
+    Batch variant of generate_product_number, used for whole S_MARA.PRODUCT columns.
+    Draws the digit blocks and pattern letters for the whole batch with NumPy as packed
+    integer IDs, drops duplicates, and only formats the IDs that are new to product_number_set.
+
+    :param letter: Optional; choose from PATTERN_LETTERS or random.
+    :param store_in_dict: Accepted for rule compatibility with generate_product_number.
+    :param size: Number of unique product numbers to return.
+    :return: List of unique product number strings, in draw order.
+    """
+    if letter is not None and letter not in PATTERN_LETTERS:
+        raise ValueError(f"Invalid letter '{letter}'. Must be one of {PATTERN_LETTERS}.")
+
+    n_letters = len(PATTERN_LETTERS)
+    product_numbers = []
+    while len(product_numbers) < size:
+        missing = size - len(product_numbers)
+        first_three = _rng.integers(0, 1000, missing, dtype=np.int64)
+        last_five = _rng.integers(0, 100000, missing, dtype=np.int64)
+        if letter is None:
+            letter_idx = _rng.integers(0, n_letters, missing, dtype=np.int64)
+        else:
+            letter_idx = np.full(missing, PATTERN_LETTERS.index(letter), dtype=np.int64)
+
+        # Pack (first_three, letter, last_five) into one int and dedupe the batch in NumPy
+        packed = (first_three * n_letters + letter_idx) * 100000 + last_five
+        _, first_seen = np.unique(packed, return_index=True)
+        for packed_id in packed[np.sort(first_seen)].tolist():
+            head, last_five_value = divmod(packed_id, 100000)
+            first_three_value, letter_value = divmod(head, n_letters)
+            product_number = (
+                _THREE_DIGITS[first_three_value]
+                + PATTERN_LETTERS[letter_value]
+                + _FIVE_DIGITS[last_five_value]
+            )
+            key = product_number.encode('ascii')
+            if key not in product_number_set:
+                _check_unique_id_cap()
+                product_number_set.add(key)
+                _product_numbers.append(key)
+                product_numbers.append(product_number)
+    return product_numbers
+
 def assign_product_type(product_number):
     """
     Assigns a single, random product type to the given product number based on its pattern letter.
@@ -93,85 +159,39 @@ def old_product_id():
         core = core[:dash_pos] + '-' + core[dash_pos:]
     return core
 
-_datetime_value = None
-
+@lru_cache(maxsize=1)
 def get_datetime():
-    global _datetime_value
-    if _datetime_value is None:
-        _datetime_value = datetime.now().strftime("%Y.%m.%d %H:%M:%S")
-    return _datetime_value
+    """
+    Devuelve la fecha/hora de la primera llamada; get_datetime.cache_clear() la reinicia.
+    """
+    return datetime.now().strftime("%Y.%m.%d %H:%M:%S")
 
 
 
-def fk_copy(table_name):
+# Position in _product_numbers of the next product number fk_copy hands out, per child table
+_FK_COPY_NEXT = dict.fromkeys((
+    'S_MAKT', 'S_MARM', 'S_MEAN', 'S_MVKE', 'S_MLAN', 'S_MARC', 'S_MARD',
+    'S_MRP_AREA', 'S_MLGN', 'S_MLGT', 'S_MBEW', 'S_MBEW_CURRENT', 'S_MBEW_FUTURE',
+), 0)
 
-    if table_name == 'S_MAKT':
-        for product_id in product_number_set:
-            if product_id not in product_number_fk_smakt:
-                product_number_fk_smakt.add(product_id)
-                return product_id
-    elif table_name == 'S_MARM':
-        for product_id in product_number_set:
-            if product_id not in product_number_fk_smarm:
-                product_number_fk_smarm.add(product_id)
-                return product_id
-    elif table_name == 'S_MEAN':
-        for product_id in product_number_set:
-            if product_id not in product_number_fk_smean:
-                product_number_fk_smean.add(product_id)
-                return product_id
-    elif table_name == 'S_MVKE':
-        for product_id in product_number_set:
-            if product_id not in product_number_fk_smvke:
-                product_number_fk_smvke.add(product_id)
-                return product_id
-    elif table_name == 'S_MLAN':
-        for product_id in product_number_set:
-            if product_id not in product_number_fk_smlan:
-                product_number_fk_smlan.add(product_id)
-                return product_id
-    elif table_name == 'S_MARC':
-        for product_id in product_number_set:
-            if product_id not in product_number_fk_smarc:
-                product_number_fk_smarc.add(product_id)
-                return product_id
-    elif table_name == 'S_MARD':
-        for product_id in product_number_set:
-            if product_id not in product_number_fk_smard:
-                product_number_fk_smard.add(product_id)
-                return product_id
-    elif table_name == 'S_MRP_AREA':
-        for product_id in product_number_set:
-            if product_id not in product_number_fk_smrparea:
-                product_number_fk_smrparea.add(product_id)
-                return product_id
-    elif table_name == 'S_MLGN':
-        for product_id in product_number_set:
-            if product_id not in product_number_fk_smlgn:
-                product_number_fk_smlgn.add(product_id)
-                return product_id            
-    elif table_name == 'S_MLGT':
-        for product_id in product_number_set:
-            if product_id not in product_number_fk_smlgt:
-                product_number_fk_smlgt.add(product_id)
-                return product_id    
-    elif table_name == 'S_MBEW':
-        for product_id in product_number_set:
-            if product_id not in product_number_fk_smbew:
-                product_number_fk_smbew.add(product_id)
-                return product_id
-    elif table_name == 'S_MBEW_CURRENT':
-        for product_id in product_number_set:
-            if product_id not in product_number_fk_smbew_current:
-                product_number_fk_smbew_current.add(product_id)
-                return product_id            
-    elif table_name == 'S_MBEW_FUTURE':
-        for product_id in product_number_set:
-            if product_id not in product_number_fk_smbew_future:
-                product_number_fk_smbew_future.add(product_id)
-                return product_id
-    else:
-        return ""   
+
+def fk_copy(table_name):
+    position = _FK_COPY_NEXT.get(table_name)
+    if position is None:
+        return ""
+    if position >= len(_product_numbers):
+        return None
+    _FK_COPY_NEXT[table_name] = position + 1
+    return _product_numbers[position].decode('ascii')
+
+def fk_copy_batch(table_name, size):
+    """Batch variant of fk_copy: the next `size` product numbers as one slice, None past the end."""
+    position = _FK_COPY_NEXT.get(table_name)
+    if position is None:
+        return [""] * size
+    values = [number.decode('ascii') for number in _product_numbers[position:position + size]]
+    _FK_COPY_NEXT[table_name] = position + len(values)
+    return values + [None] * (size - len(values))
 
 def get_random_grouping_terms():
     return random.choice(["1", "2", "3", "4", "5"])     
@@ -191,6 +211,7 @@ def get_sales_org(delivery_plant):
         return ""
     
 _lookup_cache = {}
+_lookup_cache_rows = 0  # Parent rows held in _lookup_cache, checked against _MAX_UNIQUE_IDS
 
 def lookup_parent_value(table_name: str, fk_column_name, look_up_column, source_value, domain="material"):
     """
@@ -203,10 +224,26 @@ def lookup_parent_value(table_name: str, fk_column_name, look_up_column, source_
     else:
         return None
     
+def _read_csv(path):
+    """
+    Lee un CSV desde su copia Parquet si está al día; si no, con el lector multihilo de
+    pyarrow si está disponible, y si no con pandas.
+    """
+    if fresh_sidecar(path) is not None:
+        return read_table(path)
+    if pacsv is not None:
+        try:
+            convert_options = pacsv.ConvertOptions(strings_can_be_null=True)
+            return pacsv.read_csv(path, convert_options=convert_options).to_pandas()
+        except Exception as e:
+            print(f"[⚠️ WARNING] pyarrow could not read {path}, using pandas: {e}")
+    return pd.read_csv(path)
+
 def get_lookup_map(table_name, fk_column_name, domain="material"):
     """
     Crea y cachea un dict: {fk_value: row_dict} para accesso O(1).
     """
+    global _lookup_cache_rows
     key = f"{domain}.{table_name}.{fk_column_name}"
     if key not in _lookup_cache:
         path = os.path.join("output", domain, f"{table_name}.csv")
@@ -214,29 +251,28 @@ def get_lookup_map(table_name, fk_column_name, domain="material"):
             print(f"[⚠️ WARNING] {path} not found")
             _lookup_cache[key] = {}
             return _lookup_cache[key]
-        df = pd.read_csv(path)
-        # OJO: Puede haber duplicados, siempre toma la PRIMERA aparición
-        _lookup_cache[key] = {row[fk_column_name]: row for _, row in df.iterrows()}
+        df = _read_csv(path)
+        # OJO: Puede haber duplicados, siempre toma la ÚLTIMA aparición
+        _lookup_cache[key] = dict(zip(df[fk_column_name].tolist(), df.to_dict("records")))
+        _lookup_cache_rows += len(_lookup_cache[key])
+        if _lookup_cache_rows > _MAX_UNIQUE_IDS:
+            print(f"[⚠️ WARNING] _lookup_cache holds {_lookup_cache_rows} rows (SDG_MAX_UNIQUE_IDS={_MAX_UNIQUE_IDS})")
     return _lookup_cache[key]
 
 
+# Plant/country code mappings shared by the lookup rules
+_PLANT_TO_COUNTRY = {'US32': 'US', 'CA32': 'CA'}
+_PLANT_TO_CURRENCY = {'US32': 'USD', 'CA32': 'CAD'}
+_COUNTRY_TO_TAX = {'US': 'UTXJ', 'CA': 'CTXJ'}
+
+
 def get_country(table_name: str, fk_column_name, look_up_column, source_value):
     plant = lookup_parent_value(table_name, fk_column_name, look_up_column, source_value)
-    if plant == 'US32':
-        return 'US'
-    elif plant == 'CA32':
-        return 'CA'
-    else:
-        return ''
+    return _PLANT_TO_COUNTRY.get(plant, '')
 
 
 def get_sales_tax_cat_one(country):
-    if country == 'US':
-        return 'UTXJ'
-    elif country == 'CA':
-        return 'CTXJ'
-    else:
-        return ''
+    return _COUNTRY_TO_TAX.get(country, '')
 
 def get_valuation_class(table_name: str, fk_column_name, look_up_column, source_value):
     product_type = lookup_parent_value(table_name, fk_column_name, look_up_column, source_value)
@@ -257,12 +293,7 @@ def get_valuation_class(table_name: str, fk_column_name, look_up_column, source_
 
 def get_currency(table_name: str, fk_column_name, look_up_column, source_value):
     plant = lookup_parent_value(table_name, fk_column_name, look_up_column, source_value)
-    if plant == 'US32':
-        return 'USD'
-    elif plant == 'CA32':
-        return 'CAD'
-    else:
-        return ''
+    return _PLANT_TO_CURRENCY.get(plant, '')
 
 
 def get_product_group(v_material_type):
@@ -314,10 +345,8 @@ def assign_random_mrp_controller():
 
 
 def assign_country_origin(source_value):
-    if source_value == 'US32':
-        return 'US'
-    else:
-        return 'CA'
+    # Any plant other than US32 is treated as Canadian
+    return _PLANT_TO_COUNTRY.get(source_value, 'CA')
 
 
 def generate_wzeit_replenishment_simple():
@@ -333,12 +362,14 @@ def generate_webaz_simple():
 
 RESOURCE_PATH_SAP = os.path.join(os.path.dirname(__file__), "../resources/product_descriptions.json")
 
-with open(RESOURCE_PATH_SAP, "r") as f:
-    SAP_PRODUCT_DESCRIPTION_POOL = json.load(f)
+with open(RESOURCE_PATH_SAP, "rb") as f:
+    SAP_PRODUCT_DESCRIPTION_POOL = _json_loads(f.read())
 
-PRODUCT_DESCRIPTION_LOOKUP = {product["DESCRIPTION"]: product for product in SAP_PRODUCT_DESCRIPTION_POOL}
+# Only the descriptions are served, so keep the unique ones and drop the records
+_DESCRIPTIONS = tuple(dict.fromkeys(product["DESCRIPTION"] for product in SAP_PRODUCT_DESCRIPTION_POOL))
+del SAP_PRODUCT_DESCRIPTION_POOL
 
 
 def get_product_description():
     """Returns a random Person ID (Initials) from the SAP dummy data pool."""
-    return random.choice(list(PRODUCT_DESCRIPTION_LOOKUP.keys()))
\ No newline at end of file
+    return random.choice(_DESCRIPTIONS)
\ No newline at end of file
@@ -8,27 +8,82 @@ import json
 import random
 import re
 import string
+import itertools
 from faker import Faker
+import numpy as np
 import pandas as pd
-from collections import defaultdict
+from collections import defaultdict, deque
+from functools import lru_cache
 from core.foreign_key_util import get_foreign_values
+from core.random_state import RNG as _rng
+from core.table_store import read_table, table_columns
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # orjson is optional, the stdlib parser is the fallback
+    _json_loads = json.loads
 
 # === FAKER INSTANCES ===
-fake = Faker()
-fake_ca = Faker("en_CA")
+# Only the providers used below (names, phones, user names/e-mail domains, bank accounts)
+_FAKER_PROVIDERS = [
+    "faker.providers.person",
+    "faker.providers.phone_number",
+    "faker.providers.internet",
+    "faker.providers.bank",
+]
+fake = Faker(providers=_FAKER_PROVIDERS)
+fake_ca = Faker("en_CA", providers=_FAKER_PROVIDERS)
+
+# Faker values are pooled per provider: the first FAKER_POOL_SIZE calls hit Faker and
+# fill the pool, later calls sample from it. FAKER_POOL_SIZE=0 calls Faker every time.
+# Bank accounts and IBANs are not pooled: every vendor needs its own.
+_FAKER_POOL_SIZE = int(os.environ.get("FAKER_POOL_SIZE", 10_000))
+_faker_pools = defaultdict(list)
+
+def _faker_value(pool_name, provider):
+    """Returns a value for `provider`, drawn from (or added to) the named pool."""
+    if _FAKER_POOL_SIZE <= 0:
+        return provider()
+    pool = _faker_pools[pool_name]
+    if len(pool) < _FAKER_POOL_SIZE:
+        value = provider()
+        pool.append(value)
+        return value
+    return random.choice(pool)
 
 # === CONSTANTS AND RESOURCES ===
-_LIFNR_COUNTER = 0  # Global counter for LIFNRs (YN01)
 RESOURCE_PATH = os.path.join(os.path.dirname(__file__), "../resources/address_data.json")
 
-with open(RESOURCE_PATH, "r") as f:
-    ADDRESS_POOL = json.load(f)
-
-# Fast street/address lookups
-STREET_LOOKUP = {addr["STREET"]: addr for addr in ADDRESS_POOL}
+with open(RESOURCE_PATH, "rb") as f:
+    ADDRESS_POOL = _json_loads(f.read())
+
+# Fast street/address lookups: street -> pool index, plus one tuple per address field
+_STREET_IDX = {addr["STREET"]: i for i, addr in enumerate(ADDRESS_POOL)}
+_STREETS = tuple(_STREET_IDX)
+_POST_CODE1 = tuple(addr.get("POST_CODE1", "") for addr in ADDRESS_POOL)
+_CITY1 = tuple(addr.get("CITY1", "") for addr in ADDRESS_POOL)
+_COUNTRY = tuple(addr.get("COUNTRY", "") for addr in ADDRESS_POOL)
+_REGION = tuple(addr.get("REGION", "") for addr in ADDRESS_POOL)
+_LANGU_CORR = tuple(addr.get("LANGU_CORR", "") for addr in ADDRESS_POOL)
+
+# Precompiled patterns for the name-based rules
+_RE_NON_ALNUM_UPPER = re.compile(r'[^A-Z0-9]')
+_RE_WORD_INITIAL = re.compile(r'\b[A-Z0-9]')
+_RE_NON_ALNUM = re.compile(r'[^a-zA-Z0-9]')
+
+# Translation tables deleting every ASCII character the patterns above would strip;
+# str.translate is used for ASCII input and the regexes remain the non-ASCII fallback
+_DELETE_NON_ALNUM_UPPER = str.maketrans(
+    '', '', ''.join(c for c in map(chr, range(128)) if c not in string.ascii_uppercase + string.digits)
+)
+_DELETE_NON_ALNUM = str.maketrans(
+    '', '', ''.join(c for c in map(chr, range(128)) if c not in string.ascii_letters + string.digits)
+)
 
 # --- CACHE for parent lookups ---
-_lookup_cache = {}
+_lookup_cache = {}        # "domain.table.fk" -> {column: {fk_value: value}}
+_value_lookup_cache = {}  # (domain, table, fk, column) -> {fk_value: value}
+_parent_join_cache = {}   # (domain, table, fk, column) -> (source column, joined parent values)
 
 # === SUPPLIER RULES ===
 
@@ -48,7 +103,7 @@ def random_code() -> str:
 
 def get_random_partner_function() -> str:
     """Returns a random partner function code."""
-    return random.choice(["RS", "WL", "LF", "BA"])
+    return random.choice(_PARTNER_FUNCTIONS)
 
 def default(value):
     """Returns the value as is (default passthrough)."""
@@ -58,39 +113,57 @@ def default(value):
 
 def get_street():
     """Returns a random street from address pool."""
-    return random.choice(list(STREET_LOOKUP.keys()))
+    return random.choice(_STREETS)
 
+@lru_cache(maxsize=len(_STREETS))
 def get_post_code1(street):
     """Returns the postal code for a given street."""
-    return STREET_LOOKUP.get(street, {}).get("POST_CODE1", "")
+    i = _STREET_IDX.get(street)
+    return "" if i is None else _POST_CODE1[i]
 
+@lru_cache(maxsize=len(_STREETS))
 def get_city1(street):
     """Returns the city for a given street."""
-    return STREET_LOOKUP.get(street, {}).get("CITY1", "")
+    i = _STREET_IDX.get(street)
+    return "" if i is None else _CITY1[i]
 
+@lru_cache(maxsize=len(_STREETS))
 def get_country(street):
     """Returns the country for a given street."""
-    return STREET_LOOKUP.get(street, {}).get("COUNTRY", "")
+    i = _STREET_IDX.get(street)
+    return "" if i is None else _COUNTRY[i]
 
+@lru_cache(maxsize=len(_STREETS))
 def get_region(street):
     """Returns the region for a given street."""
-    return STREET_LOOKUP.get(street, {}).get("REGION", "")
+    i = _STREET_IDX.get(street)
+    return "" if i is None else _REGION[i]
 
+@lru_cache(maxsize=len(_STREETS))
 def get_langu_corr(street):
     """Returns the language code for a given street."""
-    return STREET_LOOKUP.get(street, {}).get("LANGU_CORR", "")
+    i = _STREET_IDX.get(street)
+    return "" if i is None else _LANGU_CORR[i]
 
 # === SUPPLIER NAME-BASED ===
 
+def _supplier_prefix(name):
+    """Word initials of `name` (or its first 4 alphanumerics if it has one word), upper-cased."""
+    upper_name = name.upper()
+    if upper_name.isascii():
+        clean_name = upper_name.translate(_DELETE_NON_ALNUM_UPPER)
+    else:
+        clean_name = _RE_NON_ALNUM_UPPER.sub('', upper_name)
+    words = _RE_WORD_INITIAL.findall(upper_name)
+    return ''.join(words)[:4] if len(words) >= 2 else clean_name[:4]
+
 def supplier_id_from_name(name: str) -> str:
     """
     Generates a supplier ID from a name, with some randomness.
     """
     if not name:
         return ""
-    clean_name = re.sub(r'[^A-Z0-9]', '', name.upper())
-    words = re.findall(r'\b[A-Z0-9]', name.upper())
-    prefix = ''.join(words)[:4] if len(words) >= 2 else clean_name[:4]
+    prefix = _supplier_prefix(name)
     suffix = (
         "-" + str(random.randint(1000000, 9999999))
         if random.random() < 0.5
@@ -102,32 +175,39 @@ def supplier_id_from_name(name: str) -> str:
 
 def optional_first_name():
     """Randomly returns a first name or None."""
-    return fake.first_name() if random.random() < 0.8312 else None
+    return _faker_value("first_name", fake.first_name) if random.random() < 0.8312 else None
 
 def conditional_last_name(first_name):
     """Returns a last name if first name exists, else None."""
-    return fake.last_name() if first_name else None
+    return _faker_value("last_name", fake.last_name) if first_name else None
+
+_PHONE_DISPATCH = {
+    "USA": lambda: _faker_value("phone_us", fake.phone_number),
+    "CANADA": lambda: _faker_value("phone_ca", fake_ca.phone_number),
+}
 
 def phone_by_country(country):
     """Returns a random phone number for country, or None."""
     if random.random() < 0.2924:
         return None
-    country = str(country).strip().upper()
-    if country == "USA":
-        return fake.phone_number()
-    elif country == "CANADA":
-        return fake_ca.phone_number()
-    else:
-        return None
+    return _dispatch_by_country(_PHONE_DISPATCH, country)
 
+@lru_cache(maxsize=2048)
 def clean_string(s):
     """Cleans a string for email use (alphanumeric, lowercased)."""
-    return re.sub(r'[^a-zA-Z0-9]', '', s or "").lower()
+    s = s or ""
+    if s.isascii():
+        return s.translate(_DELETE_NON_ALNUM).lower()
+    return _RE_NON_ALNUM.sub('', s).lower()
 
 def email_from_name_company(company=None, first_name=None, last_name=None):
     """Generates email address based on company and name."""
     if random.random() < 0.746:
         return None
+    return _email_address(company, first_name, last_name)
+
+def _email_address(company, first_name, last_name):
+    """Builds the address for email_from_name_company once it is known to be non-null."""
     company = clean_string(company)
     first_name = clean_string(first_name)
     last_name = clean_string(last_name)
@@ -138,38 +218,59 @@ def email_from_name_company(company=None, first_name=None, last_name=None):
     elif last_name:
         user_part = last_name
     else:
-        user_part = fake.user_name()
-    domain_part = f"{company}.com" if company else fake.free_email_domain()
+        user_part = _faker_value("user_name", fake.user_name)
+    domain_part = f"{company}.com" if company else _faker_value("free_email_domain", fake.free_email_domain)
     return f"{user_part}@{domain_part}"
 
 # === LOOKUPS (Parent/Child Data) ===
 
-def get_lookup_map(table_name, fk_column_name, domain="vendor"):
+def get_lookup_map(table_name, fk_column_name, domain="vendor", columns=None):
     """
-    Builds and caches a lookup: {fk_value: row_dict} for O(1) parent access.
+    Builds and caches a lookup: {column: {fk_value: value}} for O(1) parent access.
+    Only the FK column and the requested `columns` (all by default) are read, as str;
+    columns not yet in the cached map are loaded on demand.
     """
     key = f"{domain}.{table_name}.{fk_column_name}"
-    if key not in _lookup_cache:
-        path = os.path.join("output", domain, f"{table_name}.csv")
-        if not os.path.exists(path):
-            print(f"[⚠️ WARNING] {path} not found")
-            _lookup_cache[key] = {}
-            return _lookup_cache[key]
-        df = pd.read_csv(path)
-        # Always take the first appearance if duplicates
-        _lookup_cache[key] = {row[fk_column_name]: row for _, row in df.iterrows()}
-    return _lookup_cache[key]
+    lookup = _lookup_cache.setdefault(key, {})
+    path = os.path.join("output", domain, f"{table_name}.csv")
+    if not os.path.exists(path):
+        print(f"[⚠️ WARNING] {path} not found")
+        return lookup
+    header = table_columns(path)
+    wanted = header if columns is None else columns
+    missing = [column for column in wanted if column in header and column not in lookup]
+    if missing:
+        usecols = list(dict.fromkeys([fk_column_name, *missing]))
+        df = read_table(path, usecols, as_str=True)
+        # The last appearance wins on duplicate keys
+        keys = df[fk_column_name].tolist()
+        for column in missing:
+            lookup[column] = dict(zip(keys, df[column].tolist()))
+    return lookup
+
+def _parent_column_values(table_name, fk_column_name, look_up_column, domain="vendor"):
+    """Returns the cached {fk_value: value} dict for one parent column."""
+    cache_key = (domain, table_name, fk_column_name, look_up_column)
+    values = _value_lookup_cache.get(cache_key)
+    if values is None:
+        values = get_lookup_map(table_name, fk_column_name, domain, [look_up_column]).get(look_up_column, {})
+        _value_lookup_cache[cache_key] = values
+    return values
+
+def invalidate_lookup_cache(table_name, domain="vendor"):
+    """Drops cached parent lookups for `table_name` once its CSV has been (re)written."""
+    prefix = f"{domain}.{table_name}."
+    for key in [key for key in _lookup_cache if key.startswith(prefix)]:
+        del _lookup_cache[key]
+    for cache in (_value_lookup_cache, _parent_join_cache):
+        for key in [key for key in cache if key[:2] == (domain, table_name)]:
+            del cache[key]
 
 def lookup_parent_value(table_name: str, fk_column_name, look_up_column, source_value, domain="vendor"):
     """
     O(1) access to a parent row's lookup value, using an in-memory dict.
     """
-    lookup_map = get_lookup_map(table_name, fk_column_name, domain)
-    row = lookup_map.get(source_value)
-    if row is not None and look_up_column in row:
-        return row[look_up_column]
-    else:
-        return None
+    return _parent_column_values(table_name, fk_column_name, look_up_column, domain).get(source_value)
 
 # === BUSINESS RULES (Company, Bank, Tax, etc) ===
 
@@ -208,143 +309,387 @@ def get_reconciliation_account(table_name: str, fk_column_name, look_up_column,
     value = lookup_parent_value(table_name, fk_column_name, look_up_column, source_value, domain)
     return 21100000 if value == 'USA' else 21300000
 
+# === BATCH RULES (whole-column variants of the rules above) ===
+# Each *_batch function mirrors its row-level rule, with column arguments passed as
+# sequences (one value per row), and returns one value per row as a NumPy array.
+
+def lookup_parent_series(table_name: str, fk_column_name, look_up_column, source_values, domain="vendor"):
+    """
+    Vectorized lookup_parent_value: maps a sequence of FK values to the parent's lookup value.
+    The join for the latest source column is kept, so the batch rules that read the same
+    parent column for the same FK column (e.g. COUNTRY by LIFNR) share a single map.
+    """
+    cache_key = (domain, table_name, fk_column_name, look_up_column)
+    cached = _parent_join_cache.get(cache_key)
+    if cached is not None and cached[0] is source_values:
+        return cached[1]
+    values = _parent_column_values(table_name, fk_column_name, look_up_column, domain)
+    joined = pd.Series(source_values, dtype=object).map(values).to_numpy()
+    _parent_join_cache[cache_key] = (source_values, joined)
+    return joined
+
+def _is_usa(table_name, fk_column_name, look_up_column, source_values, domain):
+    """Boolean mask: parent country is 'USA' for each source value."""
+    return lookup_parent_series(table_name, fk_column_name, look_up_column, source_values, domain) == 'USA'
+
+def _faker_by_mask(mask, when_true, when_false):
+    """Fills an object array calling `when_true` where mask is set and `when_false` elsewhere."""
+    out = np.empty(len(mask), dtype=object)
+    out[mask] = [when_true() for _ in range(int(mask.sum()))]
+    out[~mask] = [when_false() for _ in range(int((~mask).sum()))]
+    return out
+
+def get_company_code_batch(table_name: str, fk_column_name, look_up_column, source_values, domain="vendor"):
+    """Batch variant of get_company_code."""
+    return np.where(_is_usa(table_name, fk_column_name, look_up_column, source_values, domain), 1704, 2910)
+
+def get_purchasing_org_batch(table_name: str, fk_column_name, look_up_column, source_values, domain="vendor"):
+    """Batch variant of get_purchasing_org."""
+    return np.where(_is_usa(table_name, fk_column_name, look_up_column, source_values, domain), "US01", "CAO1").astype(object)
+
+def get_bank_country_batch(table_name: str, fk_column_name, look_up_column, source_values, domain="vendor"):
+    """Batch variant of get_bank_country."""
+    return np.where(_is_usa(table_name, fk_column_name, look_up_column, source_values, domain), "US", "CA").astype(object)
+
+def get_account_number_batch(table_name: str, fk_column_name, look_up_column, source_values, domain="vendor"):
+    """Batch variant of get_account_number (Faker is dispatched per country group)."""
+    mask = _is_usa(table_name, fk_column_name, look_up_column, source_values, domain)
+    return _faker_by_mask(mask, fake.bban, fake_ca.bban)
+
+def get_iban_number_batch(table_name: str, fk_column_name, look_up_column, source_values, domain="vendor"):
+    """Batch variant of get_iban_number (Faker is dispatched per country group)."""
+    mask = _is_usa(table_name, fk_column_name, look_up_column, source_values, domain)
+    return _faker_by_mask(mask, fake.iban, fake_ca.iban)
+
+def get_currency_batch(table_name: str, fk_column_name, look_up_column, source_values, domain="vendor"):
+    """Batch variant of get_currency."""
+    return np.where(_is_usa(table_name, fk_column_name, look_up_column, source_values, domain), "USD", "CAD").astype(object)
+
+def get_reconciliation_account_batch(table_name: str, fk_column_name, look_up_column, source_values, domain="vendor"):
+    """Batch variant of get_reconciliation_account."""
+    return np.where(_is_usa(table_name, fk_column_name, look_up_column, source_values, domain), 21100000, 21300000)
+
+# Code pools for the bank rules
+_USA_BANK_KEYS = ("021000021", "026009593", "121000248", "021000089", "091000022")
+_CA_BANK_KEYS = ("0001004", "0040012", "0020020", "0010005", "0100063")
+_USA_BKONT_VALUES = ("01", "02", "03")  # Checking, Savings, Loan
+_CA_BKONT_VALUES = ("01", "02", "03", "04", "05")
+_PARTNER_FUNCTIONS = ("RS", "WL", "LF", "BA")
+_TAX_TYPES = ("X", "")
+
+def _none():
+    return None
+
+def _dispatch_by_country(dispatch, country):
+    """
+    Calls the rule registered for `country` in a dispatch table, or returns None.
+    The raw value is tried first so already-normalized codes skip strip()/upper().
+    """
+    rule = dispatch.get(country)
+    if rule is None and isinstance(country, str):
+        rule = dispatch.get(country.strip().upper())
+    return (rule or _none)()
+
+_BANK_KEY_DISPATCH = {
+    "US": lambda: random.choice(_USA_BANK_KEYS),
+    "CA": lambda: random.choice(_CA_BANK_KEYS),
+}
+_BKONT_DISPATCH = {
+    "US": lambda: random.choice(_USA_BKONT_VALUES),
+    "CA": lambda: random.choice(_CA_BKONT_VALUES),
+}
+_BKREF_DISPATCH = {
+    "US": lambda: f"REF-{random.randrange(1_000_000):06d}",
+    "CA": lambda: f"PAYID-{random.randrange(100_000):05d}",
+}
+# EIN: ##-####### for USA, BN: #########RT#### for CANADA
+_TAX_NUMBER_DISPATCH = {
+    "US": lambda: f"{random.randrange(100):02d}-{random.randrange(10_000_000):07d}",
+    "CA": lambda: f"{random.randrange(1_000_000_000):09d}RT{random.randrange(10_000):04d}",
+}
+_TAX_COUNTRIES = tuple(_TAX_NUMBER_DISPATCH)
+
 def generate_bank_key(country_bank):
     """Returns a random bank key for USA or CANADA."""
-    usa_bank_keys = ["021000021", "026009593", "121000248", "021000089", "091000022"]
-    canada_bank_keys = ["0001004", "0040012", "0020020", "0010005", "0100063"]
-    country_bank = (country_bank or "").strip().upper()
-    if country_bank == "US":
-        return random.choice(usa_bank_keys)
-    elif country_bank == "CA":
-        return random.choice(canada_bank_keys)
-    else:
-        return None
+    return _dispatch_by_country(_BANK_KEY_DISPATCH, country_bank)
 
 def generate_bkont(country_bank):
     """Returns a random bank control key for USA or CANADA."""
-    usa_bkont_values = ["01", "02", "03"]  # Checking, Savings, Loan
-    canada_bkont_values = ["01", "02", "03", "04", "05"]
-    country_bank = (country_bank or "").strip().upper()
-    if country_bank == "US":
-        return random.choice(usa_bkont_values)
-    elif country_bank == "CA":
-        return random.choice(canada_bkont_values)
-    else:
-        return None
+    return _dispatch_by_country(_BKONT_DISPATCH, country_bank)
 
 def generate_bkref(country_bank):
     """Returns a random bank reference for USA or CANADA."""
-    country_bank = (country_bank or "").strip().upper()
-    if country_bank == "US":
-        return f"REF-{''.join(random.choices(string.digits, k=6))}"
-    elif country_bank == "CA":
-        return f"PAYID-{''.join(random.choices(string.digits, k=5))}"
-    else:
-        return None
+    return _dispatch_by_country(_BKREF_DISPATCH, country_bank)
 
 def random_tax_type(ctx=None):
     """Randomly assigns a tax type (SAP field)."""
-    return random.choice(['X', ''])
+    return random.choice(_TAX_TYPES)
 
 def generate_tax_number():
     """Returns a random tax number for USA (EIN) or CANADA (BN)."""
-    country_code = random.choice(["US", "CA"]).strip().upper()
-    if country_code == "US":
-        # EIN: ##-#######
-        return f"{''.join(random.choices('0123456789', k=2))}-{''.join(random.choices('0123456789', k=7))}"
-    elif country_code == "CA":
-        # BN: #########RT####
-        base_number = ''.join(random.choices("0123456789", k=9))
-        suffix = "RT" + ''.join(random.choices("0123456789", k=4))
-        return f"{base_number}{suffix}"
-    else:
-        return None
+    return _TAX_NUMBER_DISPATCH[random.choice(_TAX_COUNTRIES)]()
+
+# === BATCH RULES (code pools) ===
+
+_normalized_countries = {}  # "latest" -> (source column, normalized array)
+
+def _normalize_countries(country_banks):
+    """
+    Vectorized `(country or "").strip().upper()` over a column. The latest result is reused
+    when the same column is passed again, so rules sharing a country column normalize it once.
+    """
+    cached = _normalized_countries.get("latest")
+    if cached is not None and cached[0] is country_banks:
+        return cached[1]
+    countries = pd.Series(country_banks, dtype=object).fillna("").astype(str).str.strip().str.upper().to_numpy()
+    _normalized_countries["latest"] = (country_banks, countries)
+    return countries
+
+def _random_digits(size, k):
+    """String array of `size` random, zero-padded k-digit numbers."""
+    if size == 0:
+        return np.empty(0, dtype=f"U{k}")
+    return np.char.zfill(_rng.integers(0, 10 ** k, size=size).astype(str), k)
+
+def _choice_by_country(country_banks, usa_pool, ca_pool):
+    """Draws from usa_pool for 'US' rows and ca_pool for 'CA' rows; None elsewhere."""
+    countries = _normalize_countries(country_banks)
+    out = np.full(len(countries), None, dtype=object)
+    for code, pool in (("US", usa_pool), ("CA", ca_pool)):
+        mask = countries == code
+        out[mask] = _rng.choice(pool, size=int(mask.sum()))
+    return out
+
+def get_street_batch(size):
+    """Batch variant of get_street: `size` streets drawn by index from the address pool."""
+    return np.asarray(_STREETS, dtype=object)[_rng.integers(0, len(_STREETS), size=size)]
+
+def generate_bank_key_batch(country_banks):
+    """Batch variant of generate_bank_key."""
+    return _choice_by_country(country_banks, _USA_BANK_KEYS, _CA_BANK_KEYS)
+
+def generate_bkont_batch(country_banks):
+    """Batch variant of generate_bkont."""
+    return _choice_by_country(country_banks, _USA_BKONT_VALUES, _CA_BKONT_VALUES)
+
+def generate_bkref_batch(country_banks):
+    """Batch variant of generate_bkref."""
+    countries = _normalize_countries(country_banks)
+    out = np.full(len(countries), None, dtype=object)
+    for code, prefix, k in (("US", "REF-", 6), ("CA", "PAYID-", 5)):
+        mask = countries == code
+        out[mask] = np.char.add(prefix, _random_digits(int(mask.sum()), k))
+    return out
+
+def random_code_batch(size):
+    """Batch variant of random_code."""
+    return np.full(size, "YNO1", dtype=object)
+
+def default_batch(value, size):
+    """Batch variant of default."""
+    return np.full(size, value, dtype=object)
+
+def copy_value_batch(source_values):
+    """Batch variant of copy_value."""
+    return list(source_values)
+
+def get_random_partner_function_batch(size):
+    """Batch variant of get_random_partner_function."""
+    return _rng.choice(_PARTNER_FUNCTIONS, size=size).astype(object)
+
+def random_tax_type_batch(size):
+    """Batch variant of random_tax_type."""
+    return _rng.choice(_TAX_TYPES, size=size).astype(object)
+
+def generate_tax_number_batch(size):
+    """Batch variant of generate_tax_number (EIN for US rows, BN for CA rows)."""
+    is_us = _rng.random(size) < 0.5
+    n_us = int(is_us.sum())
+    n_ca = size - n_us
+    out = np.empty(size, dtype=object)
+    out[is_us] = np.char.add(np.char.add(_random_digits(n_us, 2), "-"), _random_digits(n_us, 7))
+    out[~is_us] = np.char.add(np.char.add(_random_digits(n_ca, 9), "RT"), _random_digits(n_ca, 4))
+    return out
+
+# === BATCH RULES (supplier IDs) ===
+
+def supplier_code_batch(names):
+    """Batch variant of supplier_code."""
+    names = list(names)
+    suffixes = _rng.integers(8_000_000_000, 9_000_000_000, len(names)).tolist()
+    out = np.empty(len(names), dtype=object)
+    out[:] = [f"{''.join(name.split())[:4].upper()}-{suffix}" for name, suffix in zip(names, suffixes)]
+    return out
+
+def supplier_id_from_name_batch(names):
+    """Batch variant of supplier_id_from_name."""
+    names = list(names)
+    size = len(names)
+    long_suffix = _rng.random(size) < 0.5
+    suffixes = np.where(
+        long_suffix, _rng.integers(1_000_000, 10_000_000, size), _rng.integers(10, 100, size)
+    ).tolist()
+    out = np.empty(size, dtype=object)
+    out[:] = [
+        f"{_supplier_prefix(name)}{'-' if is_long else ''}{suffix}"[:20] if name else ""
+        for name, is_long, suffix in zip(names, long_suffix.tolist(), suffixes)
+    ]
+    return out
+
+# === BATCH RULES (person and phone) ===
+
+def _faker_values(pool_name, provider, size):
+    """Batch variant of _faker_value: `size` values for `provider` as an object array."""
+    out = np.empty(size, dtype=object)
+    if _FAKER_POOL_SIZE <= 0:
+        out[:] = [provider() for _ in range(size)]
+        return out
+    pool = _faker_pools[pool_name]
+    fresh = [provider() for _ in range(min(size, _FAKER_POOL_SIZE - len(pool)))]
+    pool.extend(fresh)
+    out[:len(fresh)] = fresh
+    if len(fresh) < size:
+        out[len(fresh):] = np.asarray(pool, dtype=object)[_rng.integers(0, len(pool), size - len(fresh))]
+    return out
+
+def optional_first_name_batch(size):
+    """Batch variant of optional_first_name."""
+    mask = _rng.random(size) < 0.8312
+    out = np.full(size, None, dtype=object)
+    out[mask] = _faker_values("first_name", fake.first_name, int(mask.sum()))
+    return out
+
+def conditional_last_name_batch(first_names):
+    """Batch variant of conditional_last_name."""
+    mask = np.array([bool(first_name) for first_name in first_names], dtype=bool)
+    out = np.full(len(mask), None, dtype=object)
+    out[mask] = _faker_values("last_name", fake.last_name, int(mask.sum()))
+    return out
+
+def phone_by_country_batch(countries):
+    """Batch variant of phone_by_country."""
+    countries = _normalize_countries(countries)
+    keep = _rng.random(len(countries)) >= 0.2924
+    out = np.full(len(countries), None, dtype=object)
+    for code, pool_name, provider in (("USA", "phone_us", fake.phone_number), ("CANADA", "phone_ca", fake_ca.phone_number)):
+        mask = keep & (countries == code)
+        out[mask] = _faker_values(pool_name, provider, int(mask.sum()))
+    return out
+
+def email_from_name_company_batch(companies, first_names, last_names):
+    """Batch variant of email_from_name_company: one mask draw, addresses built only where kept."""
+    keep = np.flatnonzero(_rng.random(len(companies)) >= 0.746)
+    out = np.full(len(companies), None, dtype=object)
+    out[keep] = [_email_address(companies[i], first_names[i], last_names[i]) for i in keep]
+    return out
 
 # === LIFNR (Vendor Number) and Foreign Key Handling ===
 
-vendor_number_set = set()
-vendor_number_fk_sddr_usage = set()
+_LIFNR_START = 300_000_000
+_LIFNR_END = 399_999_999
+_LIFNR_ITER = itertools.count(_LIFNR_START)  # Monotonic LIFNR source (YN01)
+_unused_vendor_numbers = deque()  # LIFNRs not yet handed out by fk_copy
 
 def generate_lifnr_yn01() -> str:
     """Sequentially generates LIFNR values in range 300000000 - 399999999."""
-    global _LIFNR_COUNTER
-    start_range = 300_000_000
-    end_range = 399_999_999
-    lifnr = start_range + _LIFNR_COUNTER
-    if lifnr > end_range:
+    lifnr = next(_LIFNR_ITER)
+    if lifnr > _LIFNR_END:
         raise ValueError("Exceeded YN01 number range (300000000 - 399999999)")
-    _LIFNR_COUNTER += 1
-    vendor_number = str(lifnr).zfill(9)
-    if vendor_number not in vendor_number_set:
-        vendor_number_set.add(vendor_number)
-        return vendor_number
+    vendor_number = f"{lifnr:09d}"
+    _unused_vendor_numbers.append(vendor_number)
     return vendor_number
 
+def generate_lifnr_yn01_batch(size):
+    """Batch variant of generate_lifnr_yn01: `size` consecutive LIFNRs built from one NumPy range."""
+    global _LIFNR_ITER
+    start = next(_LIFNR_ITER)
+    if start + size - 1 > _LIFNR_END:
+        _LIFNR_ITER = itertools.count(start)
+        raise ValueError("Exceeded YN01 number range (300000000 - 399999999)")
+    _LIFNR_ITER = itertools.count(start + size)
+    # Every YN01 number has 9 digits, so no zero padding is needed
+    vendor_numbers = np.arange(start, start + size, dtype=np.int64).astype(str).astype(object)
+    _unused_vendor_numbers.extend(vendor_numbers.tolist())
+    return vendor_numbers
+
 def fk_copy():
     """
-    Returns a vendor number from vendor_number_set not yet used in vendor_number_fk_sddr_usage.
+    Returns the oldest generated vendor number not yet handed out by fk_copy.
     """
-    for vendor_id in vendor_number_set:
-        if vendor_id not in vendor_number_fk_sddr_usage:
-            vendor_number_fk_sddr_usage.add(vendor_id)
-            return vendor_id
+    return _unused_vendor_numbers.popleft() if _unused_vendor_numbers else None
 
-def generate_dic(column_name, value):
-    """Utility: builds a dictionary with one column/value."""
-    return {column_name: value}
+def fk_copy_batch(size):
+    """Batch variant of fk_copy: the `size` oldest vendor numbers not yet handed out, None past the end."""
+    count = min(size, len(_unused_vendor_numbers))
+    values = [_unused_vendor_numbers.popleft() for _ in range(count)]
+    return values + [None] * (size - count)
 
 # === Foreign Key Distribution (for test data relationships) ===
 
 _pk_cache = defaultdict(list)
-_pk_generator = defaultdict(list)    # Tracks how many times each value has been used
-_row_generator_cache = {}
+_pk_available = {}                   # Values still under the usage cap, in draw order
+_pk_usage = defaultdict(int)         # Tracks how many times each value has been used
+
+_FK_MAX_USES = 2  # A foreign key value is used at most this many times per round
 
 OUTPUT_DIR = "output"
 DOMAIN = "vendor"  # Or as appropriate for this rule set
 
+def _refill_pk_available(key):
+    """Resets usage counts for `key` and queues all its values again in a new random order."""
+    values = _rng.permutation(_pk_cache[key]).tolist()
+    for value in values:
+        _pk_usage.pop(f"{key}.{value}", None)
+    _pk_available[key] = deque(values)
+    return _pk_available[key]
+
+def _load_pk_values(table_name, column_name):
+    """Loads (once) the parent values for `table_name.column_name` as a NumPy str array."""
+    key = f"{table_name}.{column_name}"
+    if key not in _pk_cache:
+        target_path = os.path.join(OUTPUT_DIR, DOMAIN, f"{table_name}.csv")
+        _pk_cache[key] = np.asarray(get_foreign_values(target_path, column_name)).astype(str)
+    if len(_pk_cache[key]) == 0:
+        print(f"[⚠️ WARNING] No values in _pk_cache for {key}")
+        return None
+    return key
+
+def _next_pk_value(key):
+    """Pops the next value for `key`, re-queueing it while it is under the usage cap."""
+    available = _pk_available.get(key) or _refill_pk_available(key)
+    value = available.popleft()
+    gen_key = f"{key}.{value}"
+    _pk_usage[gen_key] += 1
+    if _pk_usage[gen_key] < _FK_MAX_USES:
+        available.append(value)
+    return value
+
 def foreign_key(table_name, column_name, row_nums=None):
     """
     Returns a foreign key value for use in generated test data, balancing usage.
+    Values are served round-robin from a shuffled queue; each one is used at most
+    _FK_MAX_USES times before the queue is reshuffled and the counts reset.
 
     Args:
         table_name (str): The referenced table.
         column_name (str): The referenced column.
-        row_nums (int, optional): The current row index.
+        row_nums (int, optional): The current row index (unused, accepted for rule compatibility).
     Returns:
         str: The chosen foreign key value.
     """
-    row_num = row_nums
-    key = f"{table_name}.{column_name}"
-
-    if key not in _pk_cache:
-        target_path = os.path.join(OUTPUT_DIR, DOMAIN, f"{table_name}.csv")
-        _pk_cache[key] = get_foreign_values(target_path, column_name)
-
-    if not _pk_cache[key]:
-        print(f"[⚠️ WARNING] No values in _pk_cache for {key}")
+    key = _load_pk_values(table_name, column_name)
+    if key is None:
         return ""
+    return _next_pk_value(key)
 
-    attempts = 0
-    max_attempts = len(_pk_cache[key]) * 2
-    while attempts < max_attempts:
-        value = str(random.choice(_pk_cache[key]))
-        gen_key = f"{key}.{value}"
-        count = len(_pk_generator[gen_key])
-        if count < 2:
-            _pk_generator[gen_key].append(value)
-            _row_generator_cache[row_num] = generate_dic(column_name, value)
-            row_num += 1 
-            return value
-        attempts += 1
-
-    # Reset counter and try again
-    keys_to_reset = [k for k in _pk_generator if k.startswith(f"{key}.")]
-    for k in keys_to_reset:
-        del _pk_generator[k]
-
-    # Now choose a fresh value
-    value = str(random.choice(_pk_cache[key]))
-    _pk_generator[f"{key}.{value}"].append(value)
-    _row_generator_cache[row_num] = generate_dic(column_name, value)
-    row_num += 1  
-    return value
+def foreign_key_batch(table_name, column_name, size):
+    """
+    Batch variant of foreign_key: returns `size` values under the same usage cap.
+    """
+    key = _load_pk_values(table_name, column_name)
+    if key is None:
+        return np.full(size, "", dtype=object)
+    out = np.empty(size, dtype=object)
+    for i in range(size):
+        out[i] = _next_pk_value(key)
+    return out
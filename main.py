@@ -6,63 +6,138 @@ Generates synthetic tables as CSV files based on configuration and schema defini
 import os
 import pandas as pd
 import time
+from concurrent.futures import ProcessPoolExecutor
 
 from core.schema_loader import load_all_schemas
 from core.data_generator import generate_table
 from core.data_generator import generate_table_chunked
 from core.domain_utils import load_domain_rules
+from core.excel_cache import read_excel_cached
+from core.table_store import write_csv, write_sidecar
 
 OUTPUT_DIR = "output"
+CHUNK_SIZE = 5000
+CHUNK_THRESHOLD = 5000
+
+
+def _worker_count():
+    """
+    Returns the number of worker processes from SDG_WORKERS: 1 (sequential) by default,
+    "auto" for one per CPU.
+    """
+    value = os.environ.get("SDG_WORKERS", "1").strip().lower()
+    if value == "auto":
+        return os.cpu_count() or 1
+    try:
+        return max(1, int(value))
+    except ValueError:
+        print("[⚠️ WARNING] Invalid SDG_WORKERS value, running sequentially")
+        return 1
+
+
+def _table_job(row):
+    """Returns the (table_name, num_rows, column_order) arguments for a config row."""
+    column_order = row.COLUMN_ORDER if isinstance(row.COLUMN_ORDER, list) else None
+    return row.TABLE_NAME, row.ROWS, column_order
+
+
+def _split_schema(df_schema):
+    """
+    Splits a domain schema into one frame per table in a single groupby pass, so tables
+    are not each found by a boolean scan of the whole schema.
+    """
+    tables = dict(tuple(df_schema.groupby("TABLE_NAME", sort=False)))
+    # Tables missing from the schema get an empty frame, as the boolean mask gave them
+    return lambda table_name: tables.get(table_name, df_schema.iloc[:0])
+
+
+def _generate_one(domain, table_name, num_rows, column_order, df_schema):
+    """
+    Generates one table and saves it as CSV (chunked if large) under OUTPUT_DIR/domain.
+    """
+    print(f"\n[⏳] Generating {num_rows} rows for {domain}.{table_name}...")
+    rules_module = load_domain_rules(domain)
+
+    t0 = time.perf_counter()
+    if num_rows > CHUNK_THRESHOLD:
+        generate_table_chunked(
+            df_schema, table_name, num_rows, rules_module, domain,
+            chunk_size=CHUNK_SIZE, column_order=column_order
+        )
+    else:
+        df_data = generate_table(df_schema, table_name, num_rows, rules_module, domain)
+        if column_order is not None:
+            df_data = df_data[column_order]
+        output_path = os.path.join(OUTPUT_DIR, domain)
+        os.makedirs(output_path, exist_ok=True)
+        csv_path = os.path.join(output_path, f"{table_name}.csv")
+        write_csv(df_data, csv_path)
+        write_sidecar(df_data, csv_path)
+        print(f"[✅] File saved: {output_path}/{table_name}.csv")
+    # Parent lookups cached from a previous version of this table are stale now
+    if hasattr(rules_module, "invalidate_lookup_cache"):
+        rules_module.invalidate_lookup_cache(table_name, domain)
+    print(f"[PERF] Generation time: {time.perf_counter()-t0:.2f}s")
+
+
+def _generate_domain(domain, jobs, table_schemas):
+    """
+    Worker entry point: generates a domain's tables in order inside one process.
+    `table_schemas` maps each table name to its schema rows.
+    """
+    for table_name, num_rows, column_order in jobs:
+        _generate_one(domain, table_name, num_rows, column_order, table_schemas[table_name])
+
 
 def main():
     """
     Orchestrates the end-to-end data generation process:
     - Loads all schemas
     - Reads the table configuration
-    - Generates synthetic data per table and domain (chunked if large)
+    - Generates synthetic data per table and domain (chunked if large), running
+      domains in parallel processes when SDG_WORKERS > 1
     - Saves outputs as CSVs in domain-based folders
     """
     start = time.perf_counter()
     print("[PERF] Loading schemas...")
     schemas = load_all_schemas("definitions")
+    table_schema = {domain: _split_schema(df_schema) for domain, df_schema in schemas.items()}
     print(f"[PERF] Schemas loaded in {time.perf_counter()-start:.2f}s")
 
     config_start = time.perf_counter()
-    config_df = pd.read_excel("config/table_config.xlsx")
+    config_df = read_excel_cached("config/table_config.xlsx")
     config_df = config_df.sort_values(by="GEN_ORDER")
+    # Clean ROWS ("1,000" / stray newlines) and split COLUMN_ORDER once for all tables
+    config_df["ROWS"] = (
+        config_df["ROWS"].astype(str).str.replace(r"[,\n]", "", regex=True).str.strip().astype(int)
+    )
+    column_orders = config_df.get("COLUMN_ORDER", pd.Series(None, index=config_df.index)).astype(object)
+    config_df["COLUMN_ORDER"] = column_orders.str.strip().str.split(r"\s*,\s*", regex=True)
     print(f"[PERF] Config loaded in {time.perf_counter()-config_start:.2f}s")
 
-    CHUNK_SIZE = 5000
-    CHUNK_THRESHOLD = 5000
-
-    for _, row in config_df.iterrows():
-        domain = row["DOMAIN"]
-        table_name = row["TABLE_NAME"]
-        num_rows = int(str(row["ROWS"]).replace(',', '').replace('\n', '').strip())
-        column_order = None
-        col_order_val = row.get("COLUMN_ORDER")
-        if pd.notna(col_order_val):
-            column_order = [col.strip() for col in col_order_val.split(",")]
-
-        print(f"\n[⏳] Generating {num_rows} rows for {domain}.{table_name}...")
-        rules_module = load_domain_rules(domain)
-        df_schema = schemas[domain]
-
-        t0 = time.perf_counter()
-        if num_rows > CHUNK_THRESHOLD:
-            generate_table_chunked(
-                df_schema, table_name, num_rows, rules_module, domain,
-                chunk_size=CHUNK_SIZE, column_order=column_order
-            )
-        else:
-            df_data = generate_table(df_schema, table_name, num_rows, rules_module, domain)
-            if column_order is not None:
-                df_data = df_data[column_order]
-            output_path = os.path.join(OUTPUT_DIR, domain)
-            os.makedirs(output_path, exist_ok=True)
-            df_data.to_csv(os.path.join(output_path, f"{table_name}.csv"), index=False)
-            print(f"[✅] File saved: {output_path}/{table_name}.csv")
-        print(f"[PERF] Generation time: {time.perf_counter()-t0:.2f}s")
+    workers = _worker_count()
+    if workers > 1:
+        # Domains never read each other's tables, so each one runs as its own pipeline.
+        # Tables stay in GEN_ORDER inside a domain, which keeps the stateful rules
+        # (fk_copy queues, ID counters) in the process that produced them.
+        pipelines = {}
+        for row in config_df.itertuples(index=False):
+            pipelines.setdefault(row.DOMAIN, []).append(_table_job(row))
+        print(f"[PERF] Running {len(pipelines)} domain pipelines on {workers} workers")
+        with ProcessPoolExecutor(max_workers=min(workers, len(pipelines))) as executor:
+            futures = [
+                executor.submit(
+                    _generate_domain, domain, jobs,
+                    {table_name: table_schema[domain](table_name) for table_name, *_ in jobs}
+                )
+                for domain, jobs in pipelines.items()
+            ]
+            for future in futures:
+                future.result()
+    else:
+        for row in config_df.itertuples(index=False):
+            domain = row.DOMAIN
+            _generate_one(domain, *_table_job(row), table_schema[domain](row.TABLE_NAME))
 
     total = time.perf_counter() - start
     print(f"\n[⏲️ PERF] Total script runtime: {total:.2f}s")
@@ -0,0 +1,41 @@
+"""
+Checks the batch product number generator used for S_MARA.PRODUCT.
+"""
+
+import re
+import unittest
+
+from generators.custom_rules import material_rules
+
+PRODUCT_NUMBER = re.compile(r"^\d{3}[" + "".join(material_rules.PATTERN_LETTERS) + r"]\d{5}$")
+
+
+class GenerateProductNumberBatchTest(unittest.TestCase):
+    def test_unique_and_pattern_valid(self):
+        before = len(material_rules._product_numbers)
+        numbers = material_rules.generate_product_number_batch(size=5000)
+
+        self.assertEqual(len(numbers), 5000)
+        self.assertEqual(len(set(numbers)), 5000)
+        for number in numbers:
+            self.assertRegex(number, PRODUCT_NUMBER)
+        # Registered for uniqueness and for fk_copy, in generation order
+        self.assertEqual(
+            [key.decode("ascii") for key in material_rules._product_numbers[before:]], numbers
+        )
+
+    def test_unique_across_batches_and_scalar_calls(self):
+        numbers = material_rules.generate_product_number_batch(size=2000)
+        numbers.append(material_rules.generate_product_number())
+        numbers += material_rules.generate_product_number_batch(size=2000)
+        self.assertEqual(len(set(numbers)), len(numbers))
+
+    def test_fixed_letter(self):
+        numbers = material_rules.generate_product_number_batch("K", size=100)
+        self.assertTrue(all(number[3] == "K" for number in numbers))
+        with self.assertRaises(ValueError):
+            material_rules.generate_product_number_batch("Z", size=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+"""
+Checks that write_csv_rows writes the same bytes as DataFrame.to_csv on every writer path.
+"""
+
+import datetime
+import io
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from core.table_store import write_csv_rows
+
+
+def _written(df, header=True):
+    f = io.BytesIO()
+    write_csv_rows(df, f, header=header)
+    return f.getvalue()
+
+
+def _expected(df, header=True):
+    return df.to_csv(index=False, header=header, lineterminator="\n").encode("utf-8")
+
+
+class WriteCsvRowsTest(unittest.TestCase):
+    CASES = {
+        "strings and ints": pd.DataFrame({"A": ["x", "y", "z"], "B": [1, 2, 3]}),
+        "values needing quotes": pd.DataFrame({"A": ["a,b", 'say "hi"', "x\ny"], "B": ["1", "2", "3"]}),
+        "empty and missing strings": pd.DataFrame({"A": ["x", "", None], "B": ["a", "b", "c"]}),
+        "single column with empty values": pd.DataFrame({"A": ["x", "", None]}),
+        "bool and None": pd.DataFrame({"A": [True, None, False], "B": ["a", "b", "c"]}, dtype=object),
+        "datetimes and None": pd.DataFrame({
+            "A": [datetime.datetime(2020, 1, 1), None, datetime.datetime(2021, 1, 1, 5)],
+            "B": ["a", "b", "c"],
+        }).astype(object),
+        "int above int64": pd.DataFrame({"A": pd.Series([2**70, 1, None], dtype=object), "B": ["a", "b", "c"]}),
+        "ints mixed with strings": pd.DataFrame({"A": pd.Series([1, "x", None], dtype=object), "B": ["a", "b", "c"]}),
+        "floats": pd.DataFrame({"A": [1.0, 2.5, None], "B": ["a", "b", "c"]}),
+        "no rows": pd.DataFrame({"A": pd.Series([], dtype=object), "B": pd.Series([], dtype=object)}),
+    }
+
+    def test_matches_to_csv(self):
+        for name, df in self.CASES.items():
+            with self.subTest(name):
+                self.assertEqual(_written(df), _expected(df))
+
+    def test_matches_to_csv_without_header(self):
+        for name, df in self.CASES.items():
+            with self.subTest(name):
+                self.assertEqual(_written(df, header=False), _expected(df, header=False))
+
+    def test_formatter_matches_to_csv_without_pyarrow(self):
+        with mock.patch("core.table_store.pacsv", None):
+            for name, df in self.CASES.items():
+                with self.subTest(name):
+                    self.assertEqual(_written(df), _expected(df))
+
+
+if __name__ == "__main__":
+    unittest.main()